@@ -21,6 +21,13 @@ from zoneinfo import ZoneInfo
 import requests
 import yaml
 
+from utils import iter_ndjson_lines
+from utils import json_dumps
+from utils import json_loads
+
+# Dumping every request and stream event costs a stdout write per token.
+DEBUG_STREAM = os.environ.get("ALPACA_DEBUG_STREAM") == "1"
+
 SYSTEM_PROMPT = '\nYou are a highly skilled software engineer with extensive knowledge in many programming languages, frameworks, design patterns, and best practices.\n\n## Communication\n\n1. Be conversational but professional. Use a friendly tone while maintaining technical accuracy in your explanations.\n\n2. Refer to the user in the second person ("you") and yourself in the first person ("I"). Maintain this consistent voice throughout all interactions.\n\n3. Format responses in markdown for readability. Use backticks to format `file`, `directory`, `function`, and `class` names when referencing code elements.\n\n4. NEVER lie or make things up. If you don\'t know something, clearly state that rather than providing incorrect information.\n\n5. Refrain from apologizing when results are unexpected. Instead, focus on proceeding with solutions or explaining the circumstances clearly without unnecessary apologies.\n\n6. Always start responses with a newline character for consistent formatting.\n'
 
 MODELS_JSON: str = '\n{\n  "models": [\n    {\n      "name": "codellama:13b",\n      "modified_at": "2023-11-04T14:56:49.277302595-07:00",\n      "size": 7365960935,\n      "digest": "9f438cb9cd581fc025612d27f7c1a6669ff83a8bb0ed86c94fcf4c5440555697",\n      "details": {\n        "format": "gguf",\n        "family": "llama",\n        "families": null,\n        "parameter_size": "13B",\n        "quantization_level": "Q4_0"\n      }\n    },\n    {\n      "name": "llama3:latest",\n      "modified_at": "2023-12-07T09:32:18.757212583-08:00",\n      "size": 3825819519,\n      "digest": "fe938a131f40e6f6d40083c9f0f430a515233eb2edaa6d72eb85c50d64f2300e",\n      "details": {\n        "format": "gguf",\n        "family": "llama",\n        "families": null,\n        "parameter_size": "7B",\n        "quantization_level": "Q4_0"\n      }\n    }\n  ]\n}\n'
@@ -48,10 +55,12 @@ class OllamaRequestHandler(BaseHTTPRequestHandler):
                 request_data: dict[str, Any] = json.loads(post_data.decode("utf-8"))
                 messages: list[dict[str, str]] = request_data["messages"]
                 tools = request_data.get("tools", [])
-                print(f"Received tools: {tools}")
+                if DEBUG_STREAM:
+                    print(f"Received tools: {tools}")
                 messages_out: list[dict[str, str]] = []
                 for i, item in enumerate(messages):
-                    print(item)
+                    if DEBUG_STREAM:
+                        print(item)
                     messages_out.append(item)
                 self._handle_request_with_tools(messages_out, tools)
             except json.JSONDecodeError:
@@ -71,8 +80,7 @@ class OllamaRequestHandler(BaseHTTPRequestHandler):
             "message": {"role": "assistant", "content": text},
             "done": False,
         }
-        self.wfile.write(json.dumps(response).encode())
-        self.wfile.write(b"\n")
+        self.wfile.write(json_dumps(response) + b"\n")
         self.wfile.flush()
 
     def _send_completion_chunk(
@@ -103,8 +111,7 @@ class OllamaRequestHandler(BaseHTTPRequestHandler):
             "eval_count": count,
         }
 
-        self.wfile.write(json.dumps(response).encode())
-        self.wfile.write(b"\n")
+        self.wfile.write(json_dumps(response) + b"\n")
         self.wfile.flush()
 
     def _format_timestamp(self, dt: datetime.datetime) -> str:
@@ -163,7 +170,8 @@ class OllamaRequestHandler(BaseHTTPRequestHandler):
 
         if stream:
             for event in stream:
-                print(event)
+                if DEBUG_STREAM:
+                    print(event)
                 val: dict[str, Any] = event
 
                 if (
@@ -252,8 +260,7 @@ class OllamaRequestHandler(BaseHTTPRequestHandler):
             "eval_count": count,
         }
 
-        self.wfile.write(json.dumps(response).encode())
-        self.wfile.write(b"\n")
+        self.wfile.write(json_dumps(response) + b"\n")
         self.wfile.flush()
 
 
@@ -273,6 +280,9 @@ class ClaudeClient:
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
+        # Keep the TLS connection to the API alive across requests
+        self.session: requests.Session = requests.Session()
+        self.session.headers.update(self.headers)
 
     def complete(
         self,
@@ -305,9 +315,8 @@ class ClaudeClient:
         }
         if system:
             payload["system"] = system
-        response: requests.Response = requests.post(
+        response: requests.Response = self.session.post(
             url,
-            headers=self.headers,
             json=payload,
         )
         if response.status_code != 200:
@@ -373,16 +382,16 @@ class ClaudeClient:
             "temperature": temperature,
             "stream": True,
         }
-        print(payload)
+        if DEBUG_STREAM:
+            print(payload)
         if system:
             payload["system"] = system
         if tools:
             payload["tools"] = tools
         if tool_choice:
             payload["tool_choice"] = tool_choice
-        response: requests.Response = requests.post(
+        response: requests.Response = self.session.post(
             url,
-            headers=self.headers,
             json=payload,
             stream=True,
         )
@@ -391,18 +400,17 @@ class ClaudeClient:
             print(f"Error: {response.status_code}")
             print(response.text)
             response.raise_for_status()
-        for line in response.iter_lines():
-            if line:
-                line_text: str = line.decode("utf-8")
-                if line_text.startswith("data: "):
-                    json_str: str = line_text[6:]
-                    if json_str.strip() == "[DONE]":
-                        break
-                    try:
-                        chunk: dict[str, Any] = json.loads(json_str)
-                        yield chunk
-                    except json.JSONDecodeError:
-                        print(f"Failed to decode JSON: {json_str}")
+        for line in iter_ndjson_lines(response):
+            if line.startswith(b"data: "):
+                # JSON parsing skips a trailing \r, so lines are not stripped
+                json_bytes: bytes = line[6:]
+                if json_bytes.startswith(b"[DONE]"):
+                    break
+                try:
+                    chunk: dict[str, Any] = json_loads(json_bytes)
+                    yield chunk
+                except json.JSONDecodeError:
+                    print(f"Failed to decode JSON: {json_bytes!r}")
 
 
 def run_server(port: int = 11434) -> None:
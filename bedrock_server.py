@@ -8,6 +8,8 @@ from typing import Optional
 import boto3
 import yaml
 
+from utils import json_loads
+
 
 class ClaudeClient:
     """Client for interacting with Claude via AWS Bedrock"""
@@ -146,7 +148,7 @@ class ClaudeClient:
                     chunk = event["chunk"]
                     if "bytes" in chunk:
                         try:
-                            chunk_data = json.loads(chunk["bytes"].decode())
+                            chunk_data = json_loads(chunk["bytes"])
                             event_type = chunk_data.get("type", "unknown")
 
                             if event_type == "content_block_delta":
@@ -230,7 +232,7 @@ class ClaudeClient:
                     chunk = event["chunk"]
                     if "bytes" in chunk:
                         try:
-                            chunk_data = json.loads(chunk["bytes"].decode())
+                            chunk_data = json_loads(chunk["bytes"])
                             event_type = chunk_data.get("type", "unknown")
 
                             if event_type == "content_block_delta":
@@ -1,4 +1,5 @@
 import asyncio
+import concurrent.futures
 import json
 import os
 import platform
@@ -45,10 +46,17 @@ class ChatAppCore:
         self.style.configure("Custom.TButton", padding=(10, 10), width=15)
         self.style.configure("TNotebook.Tab", padding=(4, 4))
         self.file_completions: list[str] = []
+        self.saved_file_completions: tuple[str, ...] = ()
         self.last_focused_widget: SyntaxHighlightedText | None = None
         self.tabs: list[ChatTab] = []
         self.load_file_completions()
         self.mcp_manager = MCPManager()
+        # Shared by chat streams and tab summaries. Summaries are short (30 s
+        # read timeout), so this leaves room for several concurrent streams.
+        self.api_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8,
+            thread_name_prefix="ollama",
+        )
         self.event_loop = None
         self.mcp_thread = None
         self.start_mcp_event_loop()
@@ -151,6 +159,22 @@ class ChatAppCore:
         self.save_preferences()
         if self.preferences["auto_save"]:
             self.save_session()
+        for tab in self.tabs:
+            tab.stop_streaming_flag.set()
+            # Pool workers are not daemon threads, so unblock any stream read
+            # now instead of waiting out its 300 s timeout at interpreter exit.
+            # Closing from another thread does not wake a blocked read, but
+            # urllib3 >= 2.3 can shut the socket down.
+            response = tab.active_response
+            if response is not None:
+                try:
+                    if hasattr(response.raw, "shutdown"):
+                        response.raw.shutdown()
+                    else:
+                        response.close()
+                except Exception as e:
+                    print(f"Error closing stream on exit: {e}")
+        self.api_executor.shutdown(wait=False, cancel_futures=True)
         if self.event_loop and self.mcp_manager:
             asyncio.run_coroutine_threadsafe(
                 self.mcp_manager.shutdown(),
@@ -237,7 +261,7 @@ class ChatAppCore:
                 new_tab: ChatTab = ChatTab(self, self.notebook, self.file_completions)
                 new_tab.load_from_data(tab_data)
                 self.tabs.append(new_tab)
-                new_tab.rebuild_display_from_state()
+                new_tab.rebuild_display_from_state(highlight=False)
                 tab_name: str = tab_data.get("name", f"Tab {len(self.tabs)}")
                 self.notebook.tab(self.tabs.index(new_tab), text=tab_name)
             if not self.tabs:
@@ -247,19 +271,30 @@ class ChatAppCore:
                 self.notebook.select(selected_tab_index)
                 tab_name = self.notebook.tab(selected_tab_index, "text")
                 self.master.title(f"Alpaca Assist - {tab_name}")
+            # Other tabs are highlighted by on_tab_changed when first shown
+            self.tabs[self.notebook.index(self.notebook.select())].ensure_highlighted()
             print("Session loaded successfully")
         except Exception as e:
             print(f"Error loading session: {e}")
             self.create_tab()
 
     def save_file_completions(self) -> None:
-        with open("file_completions.json", "w") as f:
-            json.dump(self.file_completions, f, indent=2)
+        # Skip writes that change nothing; the snapshot is our dirty flag
+        completions = tuple(self.file_completions)
+        if completions == self.saved_file_completions:
+            return
+        # Write to a sibling file and swap it in so a crash never truncates
+        temp_path = "file_completions.json.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.file_completions, f, separators=(",", ":"))
+        os.replace(temp_path, "file_completions.json")
+        self.saved_file_completions = completions
 
     def load_file_completions(self) -> None:
         if os.path.exists("file_completions.json"):
             with open("file_completions.json") as f:
                 self.file_completions = json.load(f)
+            self.saved_file_completions = tuple(self.file_completions)
 
     def update_tabs_file_completions(self) -> None:
         for tab in self.tabs:
@@ -1,5 +1,6 @@
 import json
 import platform
+import re
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import messagebox
@@ -21,6 +22,8 @@ from text_utils import parse_code_blocks
 from tooltip import ToolTip
 from utils import is_macos
 
+LEADING_WHITESPACE_PATTERN = re.compile(r"\s*")
+
 
 class ChatApp(ChatAppCore):
     """Complete ChatApp class that extends ChatAppCore with UI functionality."""
@@ -230,7 +233,6 @@ class ChatApp(ChatAppCore):
 
         def on_closing() -> None:
             self.update_tabs_file_completions()
-            self.save_file_completions()
             completions_window.destroy()
 
         completions_window.protocol("WM_DELETE_WINDOW", on_closing)
@@ -272,36 +274,43 @@ class ChatApp(ChatAppCore):
         if isinstance(self.last_focused_widget, SyntaxHighlightedText):
             current_cursor_pos = self.last_focused_widget.index(tk.INSERT)
             text = self.last_focused_widget.get("1.0", tk.END)
-            cursor_pos = self.last_focused_widget.index(tk.INSERT)
-            line, col = map(int, cursor_pos.split("."))
+            line, col = map(int, current_cursor_pos.split("."))
             code_blocks = parse_code_blocks(text)
-            containing_blocks = []
-            for indent_level, language, start_line, end_line in code_blocks:
-                if start_line <= line <= end_line:
-                    containing_blocks.append(
-                        (indent_level, language, start_line, end_line),
-                    )
-            if containing_blocks:
-                containing_blocks.sort(key=lambda block: block[3] - block[2])
-                indent_level, language, start_line, end_line = containing_blocks[0]
+            # Innermost block around the cursor, found in one pass
+            containing_block = min(
+                (block for block in code_blocks if block[2] <= line <= block[3]),
+                key=lambda block: block[3] - block[2],
+                default=None,
+            )
+            if containing_block:
+                indent_level, language, start_line, end_line = containing_block
                 start_index = f"{start_line}.0"
                 end_index = f"{end_line}.end"
-                code_content = self.last_focused_widget.get(start_index, end_index)
-                lines = code_content.split("\n")
+                # Slice the block out of the text already fetched for parsing
+                lines = text.split("\n")[start_line - 1 : end_line]
                 if lines and lines[0].strip().startswith("```"):
                     lines = lines[1:]
                 if lines and lines[-1].strip() == "```":
                     lines = lines[:-1]
-                if lines:
-                    non_empty_lines = [line for line in lines if line.strip()]
-                    if non_empty_lines:
-                        min_indent = min(
-                            len(line) - len(line.lstrip()) for line in non_empty_lines
-                        )
-                        lines = [
-                            line[min_indent:] if line.strip() else line
-                            for line in lines
-                        ]
+                # Measure each line's indentation once; whitespace-only lines
+                # (indent == length) neither set nor lose indentation.
+                indents = [
+                    LEADING_WHITESPACE_PATTERN.match(code_line).end()
+                    for code_line in lines
+                ]
+                min_indent = min(
+                    (
+                        indent
+                        for code_line, indent in zip(lines, indents)
+                        if indent < len(code_line)
+                    ),
+                    default=0,
+                )
+                if min_indent:
+                    lines = [
+                        code_line[min_indent:] if indent < len(code_line) else code_line
+                        for code_line, indent in zip(lines, indents)
+                    ]
                 cleaned_code = "\n".join(lines)
                 pyperclip.copy(cleaned_code)
                 print(f"Code block copied to clipboard! Language: {language}")
@@ -647,6 +656,7 @@ class ChatApp(ChatAppCore):
                 tab_name = self.notebook.tab(selected_tab_index, "text")
                 self.master.title(f"Alpaca Assist - {tab_name}")
                 current_tab = self.tabs[selected_tab_index]
+                current_tab.ensure_highlighted()
                 current_tab.chat_display.focus_set()
         except tk.TclError:
             self.master.title("Alpaca Assist")
@@ -1,3 +1,4 @@
+import threading
 from dataclasses import dataclass
 from typing import Any
 from typing import List
@@ -31,16 +32,35 @@ class FullAnswer:
     components: list[AnswerComponent]
 
     def __init__(self, components: list[AnswerComponent] | None = None):
-        self.components = components or []
+        self._components: list[AnswerComponent] = components or []
+        # Streamed text not yet merged into the trailing text component, so
+        # each chunk is a list append instead of a copy of the whole answer.
+        # Worker threads read answers while the UI thread streams into them.
+        self._pending_text: list[str] = []
+        self._pending_lock = threading.Lock()
+
+    @property
+    def components(self) -> list[AnswerComponent]:
+        if self._pending_text:
+            with self._pending_lock:
+                text = "".join(self._pending_text)
+                self._pending_text.clear()
+                if self._components and isinstance(self._components[-1], str):
+                    self._components[-1] += text
+                else:
+                    self._components.append(text)
+        return self._components
+
+    @components.setter
+    def components(self, components: list[AnswerComponent]) -> None:
+        with self._pending_lock:
+            self._pending_text.clear()
+            self._components = components
 
     def add_text(self, text: str) -> None:
         """Add text content to the answer."""
-        if len(self.components) == 0:
-            self.components.append(text)
-        elif isinstance(self.components[-1], str):
-            self.components[-1] = self.components[-1] + text
-        else:
-            self.components.append(text)
+        with self._pending_lock:
+            self._pending_text.append(text)
 
     def add_tool_call(self, content: str, tool_id: str) -> None:
         """Add a tool call to the answer."""
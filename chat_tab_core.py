@@ -1,11 +1,11 @@
 import json
 import os
 import platform
-import queue
 import re
 import threading
 import time
 import tkinter as tk
+from collections import deque
 from datetime import datetime
 from tkinter import ttk
 from typing import Any
@@ -25,6 +25,32 @@ from utils import ContentUpdate
 from utils import is_macos
 
 BASE_URL: str = "http://localhost:11434/api/chat"
+TURN_SEPARATOR: str = "\n" + "-" * 80 + "\n\n"
+AUTOCOMPLETE_TRIGGER_PATTERN = re.compile(r"/(file|prompt):?$")
+FILE_FILTER_PATTERN = re.compile(r"/file:([^/\s]*)")
+PROMPT_FILTER_PATTERN = re.compile(r"/prompt:([^/\s]*)")
+# Navigation keys plus modifier releases, none of which change the line
+AUTOCOMPLETE_IGNORED_KEYSYMS = frozenset(
+    {
+        "Down",
+        "Up",
+        "Return",
+        "Escape",
+        "Left",
+        "Right",
+        "Shift_L",
+        "Shift_R",
+        "Control_L",
+        "Control_R",
+        "Alt_L",
+        "Alt_R",
+        "Meta_L",
+        "Meta_R",
+        "Super_L",
+        "Super_R",
+        "Caps_Lock",
+    },
+)
 
 
 class ChatTabCore:
@@ -34,36 +60,14 @@ class ChatTabCore:
         """Add this method - call when tab is destroyed"""
         with self._processor_lock:
             self._queue_processor_running = False
-        while not self.content_update_queue.empty():
-            try:
-                self.content_update_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.content_update_queue.clear()
         self.hide_autocomplete_menu()
 
-    def _handle_chat_display_key_release(self, event: tk.Event) -> None:
-        current_time = time.time()
-        if (
-            current_time - self._last_chat_highlight_time
-            >= self._input_highlight_throttle
-        ):
-            self.chat_display.highlight_text()
-            self._last_chat_highlight_time = current_time
-
-    def _handle_input_key_release(self, event: tk.Event) -> None:
-        """Combined handler with throttling."""
-        self.check_for_autocomplete(event)
-        current_time = time.time()
-        if (
-            current_time - self._last_input_highlight_time
-            >= self._input_highlight_throttle
-        ):
-            self.input_field.highlight_text()
-            self._last_input_highlight_time = current_time
-
     def _handle_input_key_press(self, event: tk.Event) -> None:
         """Handle key press for autocomplete only."""
-        self.check_for_autocomplete(event)
+        # Key presses only drive navigation of an open menu
+        if self.autocomplete_window:
+            self.check_for_autocomplete(event)
 
     def update_submit_button_text(self):
         """Update submit button text based on streaming state."""
@@ -72,25 +76,34 @@ class ChatTabCore:
         else:
             self.submit_button.config(text="Submit")
 
-    def has_pending_api_requests(self) -> bool:
-        """Check if there are pending API requests."""
-        return not self.input_queue.empty()
+    def rebuild_display_from_state(self, highlight: bool = True):
+        """Rebuild the entire display from ChatState (used for session loading).
 
-    def rebuild_display_from_state(self):
-        """Rebuild the entire display from ChatState (used for session loading)."""
+        With highlight=False the lexing pass is left for ensure_highlighted,
+        so restoring a session only highlights the tabs that get shown.
+        """
         questions, answers, _ = self.chat_state.get_safe_copy()
         self.chat_display.set_server_mode(True)
         self.chat_display.config(state=tk.NORMAL)
         self.chat_display.delete("1.0", tk.END)
-        for i, (question, answer) in enumerate(zip(questions, answers)):
-            self.chat_display.insert(tk.END, f"Q: {question}\n")
-            self.chat_display.insert(tk.END, f"A: {answer}\n")
-            if i < len(questions) - 1:
-                sep = "-" * 80
-                self.chat_display.insert(tk.END, f"\n{sep}\n\n")
+        self.answer_end_positions.clear()
+        turns = [
+            f"Q: {question}\nA: {answer}\n"
+            for question, answer in zip(questions, answers)
+        ]
+        self.chat_display.insert(tk.END, TURN_SEPARATOR.join(turns))
         self.chat_display.set_server_mode(False)
         self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.highlight_text()
+        if highlight:
+            self.chat_display.highlight_text()
+        else:
+            self.highlight_pending = True
+
+    def ensure_highlighted(self) -> None:
+        """Run the highlighting pass deferred by rebuild_display_from_state."""
+        if self.highlight_pending:
+            self.highlight_pending = False
+            self.chat_display.highlight_text()
 
     def update_file_completions(self, new_completions: list[str]) -> None:
         self.file_completions = new_completions
@@ -121,6 +134,7 @@ class ChatTabCore:
                 pass
             self.autocomplete_window = None
             self.autocomplete_listbox = None
+            self.autocomplete_items = []
 
     def on_autocomplete_select(self, event: tk.Event) -> None:
         """Handle selection from the autocomplete listbox."""
@@ -219,6 +233,7 @@ class ChatTabCore:
         autocomplete_type: str = "file",
     ) -> None:
         """Display the autocomplete listbox with completions (file or prompt)."""
+        shown_type = self.autocomplete_type
         self.autocomplete_type = autocomplete_type
         if autocomplete_type == "file":
             if filter_text:
@@ -249,6 +264,27 @@ class ChatTabCore:
         elif autocomplete_type == "prompt" and (not self.filtered_prompts):
             self.hide_autocomplete_menu()
             return
+        if autocomplete_type == "file":
+            display_items = [
+                os.path.basename(completion) for completion in self.filtered_completions
+            ]
+        else:
+            display_items = [
+                f"{trigger} - {description}" if description else trigger
+                for trigger, description in self.filtered_prompts
+            ]
+        if (
+            self.autocomplete_window
+            and self.autocomplete_listbox
+            and shown_type == autocomplete_type
+        ):
+            # Same kind of menu already open: move it and refresh its items
+            # instead of destroying and recreating the window per keystroke.
+            try:
+                self._update_autocomplete_menu(display_items)
+                return
+            except tk.TclError:
+                pass
         self.hide_autocomplete_menu()
         try:
             bbox_result = self.input_field.bbox("insert")
@@ -283,10 +319,7 @@ class ChatTabCore:
             return
         font_family = str(self.preferences["font_family"])
         font_size = int(str(self.preferences["font_size"]))
-        if autocomplete_type == "file":
-            num_items = len(self.filtered_completions)
-        else:
-            num_items = len(self.filtered_prompts)
+        num_items = len(display_items)
         listbox_config = {
             "height": min(8, num_items),
             "width": 60 if autocomplete_type == "prompt" else 50,
@@ -320,14 +353,8 @@ class ChatTabCore:
             **listbox_config,
         )
         self.autocomplete_listbox.pack(padx=2, pady=2, fill="both", expand=True)
-        if autocomplete_type == "file":
-            for completion in self.filtered_completions:
-                display_name = os.path.basename(completion)
-                self.autocomplete_listbox.insert(tk.END, display_name)
-        else:
-            for trigger, description in self.filtered_prompts:
-                display_text = f"{trigger} - {description}" if description else trigger
-                self.autocomplete_listbox.insert(tk.END, display_text)
+        self.autocomplete_listbox.insert(tk.END, *display_items)
+        self.autocomplete_items = display_items
         if num_items > 0:
             self.autocomplete_listbox.selection_set(0)
             self.autocomplete_listbox.activate(0)
@@ -344,6 +371,26 @@ class ChatTabCore:
         else:
             self.autocomplete_window.update_idletasks()
 
+    def _update_autocomplete_menu(self, display_items: list[str]) -> None:
+        """Reposition the open autocomplete window and refresh changed items."""
+        bbox_result = self.input_field.bbox("insert")
+        if bbox_result is None:
+            return
+        x, y, _, h = bbox_result
+        input_abs_x = self.input_field.winfo_rootx() + x
+        input_abs_y = self.input_field.winfo_rooty() + y + h + 2
+        self.autocomplete_window.geometry(f"+{input_abs_x}+{input_abs_y}")
+        if display_items == self.autocomplete_items:
+            return
+        self.autocomplete_listbox.delete(0, tk.END)
+        self.autocomplete_listbox.insert(tk.END, *display_items)
+        self.autocomplete_listbox.config(height=min(8, len(display_items)))
+        self.autocomplete_listbox.selection_set(0)
+        self.autocomplete_listbox.activate(0)
+        self.autocomplete_items = display_items
+        if self.parent.master.tk.call("tk", "windowingsystem") == "aqua":
+            self.parent.master.after(1, self._force_listbox_redraw)
+
     def check_for_autocomplete(self, event: tk.Event) -> None:
         """Check if we should show autocomplete and filter based on typed text."""
         if (
@@ -394,29 +441,24 @@ class ChatTabCore:
             elif event.keysym == "Escape":
                 self.hide_autocomplete_menu()
                 return
-        if event.type == tk.EventType.KeyRelease and event.keysym not in [
-            "Down",
-            "Up",
-            "Return",
-            "Escape",
-            "Left",
-            "Right",
-        ]:
+        if (
+            event.type == tk.EventType.KeyRelease
+            and event.keysym not in AUTOCOMPLETE_IGNORED_KEYSYMS
+        ):
             current_line = self.input_field.get("insert linestart", "insert")
             if event.char in [":", "/"]:
-                if current_line.endswith("/file:") or current_line.endswith("/file"):
+                trigger_match = AUTOCOMPLETE_TRIGGER_PATTERN.search(current_line)
+                if trigger_match and trigger_match.group(1) == "file":
                     self.file_trigger_position = self.input_field.index("insert")
                     self.prompt_trigger_position = None
                     self.show_autocomplete_menu(autocomplete_type="file")
                     return
-                elif current_line.endswith("/prompt:") or current_line.endswith(
-                    "/prompt",
-                ):
+                elif trigger_match:
                     self.prompt_trigger_position = self.input_field.index("insert")
                     self.file_trigger_position = None
                     self.show_autocomplete_menu(autocomplete_type="prompt")
                     return
-            file_match = re.search("/file:([^/\\s]*)", current_line)
+            file_match = FILE_FILTER_PATTERN.search(current_line)
             if file_match:
                 typed_text = file_match.group(1)
                 colon_pos = current_line.rfind("/file:") + 6
@@ -424,7 +466,7 @@ class ChatTabCore:
                 self.prompt_trigger_position = None
                 self.show_autocomplete_menu(typed_text, autocomplete_type="file")
                 return
-            prompt_match = re.search("/prompt:([^/\\s]*)", current_line)
+            prompt_match = PROMPT_FILTER_PATTERN.search(current_line)
             if prompt_match:
                 typed_text = prompt_match.group(1)
                 colon_pos = current_line.rfind("/prompt:") + 8
@@ -492,6 +534,7 @@ class ChatTabCore:
         self.chat_history_answers = [
             answer.get_text_content() for answer in self.chat_state.answers
         ]
+        self.clear_history_caches()
         self.summary_generated = data.get("summary_generated", False)
         if "original_conversation_id" in data:
             self.original_conversation_id = data["original_conversation_id"]
@@ -534,7 +577,6 @@ class ChatTabCore:
         self.parent = parent
         self.notebook = notebook
         self.preferences = preferences or parent.preferences
-        self.input_queue: queue.Queue = queue.Queue()
         self.last_update_time: float = 0.0
         self.update_throttle = float(
             str(self.preferences.get("chat_update_throttle", 0.1)),
@@ -543,22 +585,26 @@ class ChatTabCore:
         notebook.add(self.frame, text=f"Tab {len(parent.tabs) + 1}")
         self.create_widgets()
         self.summary_generated: bool = False
+        self.highlight_pending: bool = False
         self.file_completions: list[str] = file_completions
         self.chat_display: SyntaxHighlightedText
         self.input_field: SyntaxHighlightedText
         self.autocomplete_window: tk.Toplevel | None = None
         self.autocomplete_listbox: tk.Listbox | None = None
+        self.autocomplete_items: list[str] = []
         self.file_trigger_position: str | None = None
         self.filtered_completions: list[str] = []
         self.prompt_trigger_position: str | None = None
         self.filtered_prompts: list[str] = []
         self.autocomplete_type: str | None = None
-        self.content_update_queue: queue.Queue[ContentUpdate] = queue.Queue()
+        self.content_update_queue: deque[ContentUpdate] = deque()
         self.answer_end_positions: dict[int, str] = {}
         self._processor_lock = threading.Lock()
         self._queue_processor_running: bool = False
+        self._processor_scheduled: bool = False
         self.is_streaming: bool = False
         self.current_request_thread: threading.Thread | None = None
+        self.active_response: requests.Response | None = None
         self.stop_streaming_flag: threading.Event = threading.Event()
 
     def create_widgets(self) -> None:
@@ -590,8 +636,7 @@ class ChatTabCore:
             lambda e: self.parent.export_to_html() or "break",
         )
         self.chat_display.bind("<FocusIn>", self.parent.update_last_focused)
-        self._last_chat_highlight_time = 0.0
-        self.chat_display.bind("<KeyRelease>", self._handle_chat_display_key_release)
+        # add="+" keeps the widget's own debounced highlighting binding
         self.chat_display.bind(
             "<KeyRelease>",
             self._on_chat_display_text_change,
@@ -620,9 +665,7 @@ class ChatTabCore:
         self.input_field.bind("<Control-e>", self.go_to_end_of_line)
         self.input_field.bind("<Control-a>", self.go_to_start_of_line)
         self.input_field.bind("<FocusIn>", self.parent.update_last_focused)
-        self._last_input_highlight_time = 0.0
-        self._input_highlight_throttle = 0.15
-        self.input_field.bind("<KeyRelease>", self._handle_input_key_release)
+        self.input_field.bind("<KeyRelease>", self.check_for_autocomplete, add="+")
         self.input_field.bind("<KeyPress>", self._handle_input_key_press)
         self.input_field.bind("<FocusOut>", lambda e: self.hide_autocomplete_menu())
         self.input_field.bind("<Button-1>", lambda e: self.hide_autocomplete_menu())
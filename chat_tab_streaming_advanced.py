@@ -1,11 +1,12 @@
 import concurrent.futures
 import json
-import queue
+import os
 import re
 import sys
 import threading
 import time
 import tkinter as tk
+import traceback
 from typing import Any
 from typing import Dict
 from typing import List
@@ -17,7 +18,14 @@ import requests
 from chat_tab_streaming_core import ChatTabStreamingCore
 from expansion_language import expand
 from tool_progress_manager import ToolProgressManager
+from utils import CONNECT_TIMEOUT
 from utils import ContentUpdate
+from utils import DONE_MARKER
+from utils import DONE_MARKER_SPACED
+from utils import fast_stream_content
+from utils import iter_ndjson_lines
+from utils import json_loads
+from utils import OLLAMA_SESSION
 
 BASE_URL: str = "http://localhost:11434/api/chat"
 WHITESPACE_PATTERN = re.compile("\\s+")
@@ -33,74 +41,92 @@ OPENAI_TOOL_CALLS_PATTERN = re.compile(
     re.DOTALL,
 )
 PROMPT_PATTERN = re.compile("/prompt:(\\w+)")
+# Per-chunk tracebacks cost a stdout write per failing line of the stream.
+DEBUG_STREAM = os.environ.get("ALPACA_DEBUG_STREAM") == "1"
 
 
 class ChatTabStreamingAdvanced(ChatTabStreamingCore):
     """Streaming functionality for ChatTab - Advanced tool execution, connection management, and UI interactions."""
 
-    def fetch_api_response(self, answer_index: int) -> None:
+    def _history_turn_messages(
+        self,
+        question: str,
+        answer: str,
+    ) -> list[dict[str, Any]]:
+        """Build the Ollama messages for one completed question/answer turn.
+
+        Completed turns never change, so the result is cached on the tab and
+        later requests only build messages for turns they have not seen.
+        """
+        cached = self.turn_messages_cache.get((question, answer))
+        if cached is None:
+            cached = self._build_turn_messages(question, answer)
+            self.turn_messages_cache[(question, answer)] = cached
+        return cached
+
+    def _build_turn_messages(
+        self,
+        question: str,
+        answer: str,
+    ) -> list[dict[str, Any]]:
+        """Build the Ollama messages for one question/answer turn, uncached."""
+        (
+            assistant_content,
+            tool_results,
+            jsons,
+        ) = self._extract_tool_results_from_content(answer)
+        messages: list[dict[str, Any]] = [
+            {"role": "user", "content": self._expand_history_question(question)},
+        ]
+        if assistant_content.strip():
+            messages.append({"role": "assistant", "content": assistant_content})
+        for tool_result, js in zip(tool_results, jsons):
+            tool_result_message = {
+                "role": "tool_result",
+                "content": f"Tool execution result:\n{tool_result}",
+            }
+            if "id" in js["tool_call"]:
+                tool_result_message["id"] = js["tool_call"]["id"]
+            messages.extend(
+                (
+                    {
+                        "role": "tool_use_call",
+                        "content": "data",
+                        "call": js["tool_call"],
+                    },
+                    tool_result_message,
+                ),
+            )
+        return messages
+
+    def fetch_api_response(
+        self,
+        answer_index: int,
+        data_payload: dict[str, Any],
+    ) -> None:
         """Fetch API response for a specific answer index using queue-based updates."""
+        self.current_request_thread = threading.current_thread()
         try:
             if self.stop_streaming_flag.is_set():
                 print(f"Streaming stopped before API request for answer {answer_index}")
                 return
             self.parent.check_mcp_status()
-            data_payload: dict[str, Any] = self.input_queue.get(timeout=3)
-            if data_payload is None:
-                return
-            payload_answer_index = data_payload.get("answer_index")
-            if payload_answer_index != answer_index:
-                print(
-                    f"Warning: Answer index mismatch. Expected {answer_index}, got {payload_answer_index}",
-                )
-                return
-            if "messages" in data_payload:
-                messages = data_payload["messages"]
-            else:
-                messages: list[dict[str, str]] = []
-                for q, a in zip(
-                    data_payload["chat_history_questions"],
-                    data_payload["chat_history_answers"],
-                ):
-                    if q.strip() and a.strip():
-                        expanded_q = expand(q)
-                        messages.append({"role": "user", "content": expanded_q})
-                        (
-                            assistant_content,
-                            tool_results,
-                            jsons,
-                        ) = self._extract_tool_results_from_content(a)
-                        if assistant_content.strip():
-                            messages.append(
-                                {"role": "assistant", "content": assistant_content},
-                            )
-                        for tool_result, js in zip(tool_results, jsons):
-                            messages.append(
-                                {
-                                    "role": "tool_use_call",
-                                    "content": "data",
-                                    "call": js["tool_call"],
-                                },
-                            )
-                            if "id" in js["tool_call"]:
-                                messages.append(
-                                    {
-                                        "role": "tool_result",
-                                        "content": f"Tool execution result:\n{tool_result}",
-                                        "id": js["tool_call"]["id"],
-                                    },
-                                )
-                            else:
-                                messages.append(
-                                    {
-                                        "role": "tool_result",
-                                        "content": f"Tool execution result:\n{tool_result}",
-                                    },
-                                )
-                messages.append({"role": "user", "content": data_payload["prompt"]})
+            model = data_payload["model"]
+            messages = data_payload.get("messages")
+            if messages is None:
+                history_questions = data_payload["chat_history_questions"]
+                history_answers = data_payload["chat_history_answers"]
+                prompt = data_payload["prompt"]
+                messages = [
+                    message
+                    for q, a in zip(history_questions, history_answers)
+                    if q.strip() and a.strip()
+                    for message in self._history_turn_messages(q, a)
+                ]
+                messages.append({"role": "user", "content": prompt})
             available_tools = self.parent.get_available_mcp_tools()
             ollama_payload: dict[str, Any] = {
-                "model": data_payload["model"],
+                "model": model,
                 "messages": messages,
                 "stream": True,
             }
@@ -119,17 +145,9 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             print(
                 f"Unexpected error in fetch_api_response for answer index {answer_index}: {e}",
             )
-            import traceback
-
             traceback.print_exc()
             if not self.stop_streaming_flag.is_set():
-                error_update = ContentUpdate(
-                    answer_index=answer_index,
-                    content_chunk=error_msg,
-                    is_done=True,
-                    is_error=True,
-                )
-                self._put_content_update_with_retry(error_update)
+                self._put_error_update(answer_index, error_msg)
         finally:
             print(f"API request thread ending for answer index {answer_index}")
             self.is_streaming = False
@@ -380,11 +398,7 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                     f"Clearing {self._pending_tool_executions} pending tool executions",
                 )
                 self._pending_tool_executions = 0
-        while not self.content_update_queue.empty():
-            try:
-                self.content_update_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.content_update_queue.clear()
         if self.chat_state.is_streaming():
             current_answer_index = len(self.chat_state.answers) - 1
             if current_answer_index >= 0:
@@ -455,46 +469,21 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                 )
                 self._put_content_update_with_retry(done_update)
                 return
-            messages: list[dict[str, str]] = []
-            for i, (q, a) in enumerate(zip(questions, answers)):
-                a = a.get_text_content()
-                if i <= answer_index and q.strip():
-                    messages.append({"role": "user", "content": expand(q)})
-                    if a.strip():
-                        (
-                            assistant_content,
-                            tool_results,
-                            jsons,
-                        ) = self._extract_tool_results_from_content(a)
-                        if assistant_content.strip():
-                            messages.append(
-                                {"role": "assistant", "content": assistant_content},
-                            )
-                        for tool_result, js in zip(tool_results, jsons):
-                            messages.append(
-                                {
-                                    "role": "tool_use_call",
-                                    "content": "data",
-                                    "call": js["tool_call"],
-                                },
-                            )
-                            if "id" in js["tool_call"]:
-                                messages.append(
-                                    {
-                                        "role": "tool_result",
-                                        "content": f"Tool execution result:\n{tool_result}",
-                                        "id": js["tool_call"]["id"],
-                                    },
-                                )
-                            else:
-                                messages.append(
-                                    {
-                                        "role": "tool_result",
-                                        "content": f"Tool execution result:\n{tool_result}",
-                                    },
-                                )
-                elif i > answer_index:
-                    break
+            # Earlier turns are finished and come from the per-turn cache; the
+            # answer being continued is still growing, so it is built fresh
+            messages: list[dict[str, Any]] = []
+            for q, a in zip(questions[:answer_index], answers[:answer_index]):
+                if q.strip():
+                    messages.extend(
+                        self._history_turn_messages(q, a.get_text_content()),
+                    )
+            if questions[answer_index].strip():
+                messages.extend(
+                    self._build_turn_messages(
+                        questions[answer_index],
+                        answers[answer_index].get_text_content(),
+                    ),
+                )
             print(f"Prepared {len(messages)} messages for continuation")
             selected_model = self.parent.get_selected_model()
             continuation_payload = {
@@ -520,17 +509,9 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
         except Exception as e:
             error_msg = f"Unexpected error in continuation: {str(e)}"
             print(f"{error_msg}")
-            import traceback
-
             traceback.print_exc()
             self.is_streaming = False
-            error_update = ContentUpdate(
-                answer_index=answer_index,
-                content_chunk=f"\n\n[{error_msg}]",
-                is_done=True,
-                is_error=True,
-            )
-            self._put_content_update_with_retry(error_update)
+            self._put_error_update(answer_index, f"\n\n[{error_msg}]")
 
     def _replace_openai_tool_calls_in_display(self, answer_index: int) -> None:
         """Thread-safe version that ensures UI operations run on main thread."""
@@ -616,139 +597,132 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             self.chat_display.config(state=tk.DISABLED)
         except Exception as e:
             print(f"Error replacing OpenAI tool calls in display: {e}")
-            import traceback
-
             traceback.print_exc()
             self.chat_display.config(state=tk.DISABLED)
 
+    def _pop_coalesced_update(self) -> ContentUpdate | None:
+        """Pop the next update, merged with any queued chunks for the same answer.
+
+        Streaming produces one update per token; merging the ones already
+        waiting means a single chat_state append and Tk insert per batch.
+        """
+        pending = self.content_update_queue
+        try:
+            update = pending.popleft()
+        except IndexError:
+            return None
+        if update.is_error or update.is_done:
+            return update
+        chunks = [update.content_chunk]
+        is_done = False
+        while pending and not is_done:
+            next_update = pending[0]
+            if next_update.is_error or next_update.answer_index != update.answer_index:
+                break
+            pending.popleft()
+            chunks.append(next_update.content_chunk)
+            is_done = next_update.is_done
+        if len(chunks) == 1:
+            return update
+        return ContentUpdate(update.answer_index, "".join(chunks), is_done, False)
+
+    def _run_scheduled_highlight(self) -> None:
+        self._highlight_scheduled = False
+        self.chat_display.highlight_text()
+
     def process_content_queue(self) -> None:
-        """Process queue with smart highlighting throttling and proper termination."""
+        """Drain queued updates into the display, highlighting once per cycle."""
         with self._processor_lock:
+            self._processor_scheduled = False
             if not self._queue_processor_running:
                 print("Queue processor stopping - flag is False")
                 return
-        updates_processed = 0
         streaming_finished = False
-        content_accumulated = 0
-        last_highlight_time = time.time()
-        has_pending_updates = False
         chars_since_newline = getattr(self, "_chars_since_last_newline", 0)
         NEWLINE_THRESHOLD = 900000
-        HIGHLIGHT_MIN_INTERVAL = 0.2
-        HIGHLIGHT_CONTENT_THRESHOLD = 100
-        HIGHLIGHT_UPDATE_THRESHOLD = 10
-        MAX_UPDATES_PER_CYCLE = 10
+        MAX_UPDATES_PER_CYCLE = 50
         CYCLE_TIME_LIMIT = 0.05
         cycle_start_time = time.time()
         updates_this_cycle = 0
         try:
             while True:
                 if updates_this_cycle >= MAX_UPDATES_PER_CYCLE:
-                    print(
-                        f"Reached update limit ({MAX_UPDATES_PER_CYCLE}), yielding control",
-                    )
                     break
                 if time.time() - cycle_start_time > CYCLE_TIME_LIMIT:
-                    print(
-                        f"Cycle time limit reached ({CYCLE_TIME_LIMIT}s), yielding control",
-                    )
                     break
-                try:
-                    update = self.content_update_queue.get(timeout=0.001)
-                    has_pending_updates = True
-                    updates_this_cycle += 1
-                    if update.is_error:
-                        error_content = f"\n\n[Error: {update.content_chunk}]"
-                        self.chat_state.append_to_answer(
-                            update.answer_index,
-                            error_content,
+                update = self._pop_coalesced_update()
+                if update is None:
+                    break
+                updates_this_cycle += 1
+                if update.is_error:
+                    error_content = f"\n\n[Error: {update.content_chunk}]"
+                    self.chat_state.append_to_answer(
+                        update.answer_index,
+                        error_content,
+                    )
+                    self.chat_state.finish_streaming()
+                    content_to_insert = error_content
+                    streaming_finished = True
+                    chars_since_newline = 0
+                else:
+                    original_content = update.content_chunk
+                    content_to_insert = self._add_newlines_to_long_content(
+                        original_content,
+                        chars_since_newline,
+                        NEWLINE_THRESHOLD,
+                    )
+                    if "\n" in content_to_insert:
+                        last_newline_pos = content_to_insert.rfind("\n")
+                        chars_since_newline = (
+                            len(content_to_insert) - last_newline_pos - 1
                         )
-                        self.chat_state.finish_streaming()
-                        content_to_insert = error_content
-                        streaming_finished = True
-                        chars_since_newline = 0
                     else:
-                        original_content = update.content_chunk
-                        content_to_insert = self._add_newlines_to_long_content(
-                            original_content,
-                            chars_since_newline,
-                            NEWLINE_THRESHOLD,
-                        )
-                        if "\n" in content_to_insert:
-                            last_newline_pos = content_to_insert.rfind("\n")
-                            chars_since_newline = (
-                                len(content_to_insert) - last_newline_pos - 1
-                            )
-                        else:
-                            chars_since_newline += len(content_to_insert)
-                        self.chat_state.append_to_answer(
-                            update.answer_index,
-                            content_to_insert,
-                        )
-                        if update.is_done:
-                            self.chat_state.finish_streaming()
-                            streaming_finished = True
-                    self._chars_since_last_newline = chars_since_newline
-                    self._insert_content_at_answer(
+                        chars_since_newline += len(content_to_insert)
+                    self.chat_state.append_to_answer(
                         update.answer_index,
                         content_to_insert,
                     )
-                    updates_processed += 1
-                    content_accumulated += len(content_to_insert)
-                    current_time = time.time()
-                    time_since_last_highlight = current_time - last_highlight_time
-                    is_tool_indicator = (
-                        "⚡" in content_to_insert or "🔧" in content_to_insert
-                    )
-                    is_code_block = "```" in content_to_insert
-                    should_highlight = (
-                        time_since_last_highlight >= HIGHLIGHT_MIN_INTERVAL
-                        or content_accumulated >= HIGHLIGHT_CONTENT_THRESHOLD
-                        or updates_processed >= HIGHLIGHT_UPDATE_THRESHOLD
-                        or update.is_done
-                        or is_tool_indicator
-                        or is_code_block
-                    )
-                    if should_highlight:
-                        self.chat_display.highlight_text()
-                        last_highlight_time = current_time
-                        content_accumulated = 0
-                        updates_processed = 0
-                    if (
-                        update.is_done
-                        and update.answer_index == 0
-                        and (not self.summary_generated)
-                    ):
-                        self.parent.master.after(3000, self.get_summary)
-                    if streaming_finished:
-                        break
-                except queue.Empty:
+                    if update.is_done:
+                        self.chat_state.finish_streaming()
+                        streaming_finished = True
+                self._chars_since_last_newline = chars_since_newline
+                self._insert_content_at_answer(
+                    update.answer_index,
+                    content_to_insert,
+                )
+                if (
+                    update.is_done
+                    and update.answer_index == 0
+                    and (not self.summary_generated)
+                ):
+                    self.parent.master.after(3000, self.get_summary)
+                if streaming_finished:
                     break
-            current_time = time.time()
-            if updates_processed > 0 or content_accumulated > 0:
-                self.parent.master.after(10, lambda: self.chat_display.highlight_text())
+            # One highlighting pass covers everything inserted this cycle, and
+            # cycles that land before it runs share it
+            if updates_this_cycle and not self._highlight_scheduled:
+                self._highlight_scheduled = True
+                self.parent.master.after(10, self._run_scheduled_highlight)
             if streaming_finished and (not self._has_pending_tool_execution()):
                 print("Streaming finished and no pending tool executions - finishing")
                 self._finish_streaming()
                 return
             with self._processor_lock:
-                if self._queue_processor_running:
-                    if (
-                        has_pending_updates
-                        and updates_this_cycle >= MAX_UPDATES_PER_CYCLE
-                    ):
-                        delay = 10
-                    elif has_pending_updates or self._has_pending_tool_execution():
-                        delay = 50
-                    else:
-                        delay = 200
-                    self.parent.master.after(delay, self.process_content_queue)
-                else:
+                if not self._queue_processor_running:
                     print("Queue processor stopping - manually stopped")
+                elif not self._processor_scheduled:
+                    if self.content_update_queue:
+                        # Work left over from a capped cycle: resume once Tk
+                        # has handled pending events instead of on a timer.
+                        self._processor_scheduled = True
+                        self.parent.master.after_idle(self.process_content_queue)
+                    elif self._has_pending_tool_execution():
+                        # Tool completion is not signalled through the queue
+                        self._processor_scheduled = True
+                        self.parent.master.after(50, self.process_content_queue)
+                    # Otherwise stay idle until the next put wakes the processor
         except Exception as e:
             print(f"Error in queue processor: {e}")
-            import traceback
-
             traceback.print_exc()
             self._finish_streaming()
 
@@ -804,6 +778,18 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
         clean_content = MULTIPLE_NEWLINES_PATTERN.sub("\n\n", clean_content).strip()
         return (clean_content, tool_results, tool_call_jsons)
 
+    def _set_answer_end_mark(self, answer_index: int, position: str) -> str:
+        """Place a right-gravity mark at the end of an answer and remember it.
+
+        Text inserted at the mark lands before it, so Tk keeps the mark at the
+        end of the answer without re-deriving its index on every chunk.
+        """
+        end_mark = f"answer_end_{answer_index}"
+        self.chat_display.mark_set(end_mark, position)
+        self.chat_display.mark_gravity(end_mark, tk.RIGHT)
+        self.answer_end_positions[answer_index] = end_mark
+        return end_mark
+
     def _insert_content_at_answer(self, answer_index: int, content: str) -> None:
         """Thread-safe version that ensures UI operations run on main thread."""
         if not content:
@@ -815,12 +801,13 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             return
         self.chat_display.set_server_mode(True)
         self.chat_display.config(state=tk.NORMAL)
-        if answer_index in self.answer_end_positions:
-            insert_pos = self.answer_end_positions[answer_index]
-        else:
-            insert_pos = self._find_answer_position(answer_index)
-        self.chat_display.insert(insert_pos, content)
-        self.answer_end_positions[answer_index] = f"{insert_pos} + {len(content)}c"
+        end_mark = self.answer_end_positions.get(answer_index)
+        if end_mark is None:
+            end_mark = self._set_answer_end_mark(
+                answer_index,
+                self._find_answer_position(answer_index),
+            )
+        self.chat_display.insert(end_mark, content)
         if self._was_at_bottom():
             try:
                 current_xview = self.chat_display.xview()
@@ -871,6 +858,12 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
 
             expanded_input = PROMPT_PATTERN.sub(expand_prompt, expanded_input)
         self.hide_autocomplete_menu()
+        # Snapshot the finished turns before adding this one; the worker only
+        # needs their text, not copies of every answer's components.
+        history_questions = self.chat_state.questions.copy()
+        history_answers = [
+            answer.get_text_content() for answer in self.chat_state.answers
+        ]
         answer_index = self.chat_state.add_question(expanded_input)
         self.input_field.delete("1.0", tk.END)
         if answer_index > 0:
@@ -878,29 +871,24 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             self._insert_structural_content(f"\n{separator}\n\n")
         self._insert_structural_content(f"Q: {expanded_input}\n")
         self._insert_structural_content(f"A:\n")
-        self.answer_end_positions[answer_index] = self.chat_display.index(
-            tk.END + " -1c",
-        )
+        self._set_answer_end_mark(answer_index, tk.END + " -1c")
         selected_model = self.parent.get_selected_model()
-        questions, answers, _ = self.chat_state.get_safe_copy_full()
         data_payload = {
             "prompt": expanded_input,
             "model": selected_model,
-            "chat_history_questions": questions,
-            "chat_history_answers": [x.get_text_content() for x in answers],
+            "chat_history_questions": history_questions,
+            "chat_history_answers": history_answers,
             "answer_index": answer_index,
         }
-        self.input_queue.put(data_payload)
         self.is_streaming = True
         self.stop_streaming_flag.clear()
         self.update_submit_button_text()
         self._start_processor_if_needed()
-        self.current_request_thread = threading.Thread(
-            target=self.fetch_api_response,
-            args=(answer_index,),
-            daemon=True,
+        self.parent.api_executor.submit(
+            self.fetch_api_response,
+            answer_index,
+            data_payload,
         )
-        self.current_request_thread.start()
         return "break"
 
     def _handle_tool_calls_with_managed_connection(
@@ -1054,8 +1042,6 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                     continuation_thread.start()
                 except Exception as tool_error:
                     print(f"Error executing tool calls: {tool_error}")
-                    import traceback
-
                     traceback.print_exc()
                     if response and self.connection_manager:
                         try:
@@ -1065,13 +1051,7 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                     if response:
                         self._graceful_connection_close(response)
                     error_text = f"\n\n**Tool Execution Error:** {str(tool_error)}"
-                    error_update = ContentUpdate(
-                        answer_index=answer_index,
-                        content_chunk=error_text,
-                        is_done=True,
-                        is_error=True,
-                    )
-                    self._put_content_update_with_retry(error_update)
+                    self._put_error_update(answer_index, error_text)
 
             tool_thread = threading.Thread(target=execute_and_continue, daemon=True)
             tool_thread.start()
@@ -1145,8 +1125,6 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                 print("Cleared _was_intelligent_wrap_active_before_submit flag")
         except Exception as e:
             print(f"Error in _finish_streaming: {e}")
-            import traceback
-
             traceback.print_exc()
             self.is_streaming = False
             with self._processor_lock:
@@ -1160,6 +1138,9 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
     ) -> None:
         """Modified version that filters out tool call JSON from display while still detecting complete tool calls."""
         response = None
+        skipped_chunks = 0
+        failed_chunks = 0
+        first_chunk_error: Exception | None = None
         try:
             if not self.is_streaming:
                 print(
@@ -1174,21 +1155,24 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             last_sent_position = 0
             tool_call_buffer = ""
             in_potential_tool_call = False
-            response = requests.post(BASE_URL, json=payload, stream=True, timeout=300)
+            response = OLLAMA_SESSION.post(
+                BASE_URL,
+                json=payload,
+                stream=True,
+                timeout=(CONNECT_TIMEOUT, 300),
+            )
+            # Lets on_closing unblock this worker's read by shutting the stream down
+            self.active_response = response
             if response.status_code != 200:
                 error_msg = f"{request_type.capitalize()} API Error: Status code {response.status_code}"
                 print(error_msg)
-                error_update = ContentUpdate(
-                    answer_index=answer_index,
-                    content_chunk=error_msg,
-                    is_done=True,
-                    is_error=True,
-                )
-                self._put_content_update_with_retry(error_update)
+                self._put_error_update(answer_index, error_msg)
                 return
+            put_update = self._put_content_update_with_retry
+            stop_requested = self.stop_streaming_flag.is_set
             try:
-                for line in response.iter_lines(decode_unicode=True):
-                    if self.stop_streaming_flag.is_set():
+                for line in iter_ndjson_lines(response):
+                    if stop_requested():
                         print(
                             f"Streaming stopped during {request_type} response for answer {answer_index}",
                         )
@@ -1197,56 +1181,61 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                     if not line:
                         continue
                     try:
-                        data = json.loads(line.strip())
-                        if "message" in data and "content" in data["message"]:
-                            content_chunk = data["message"]["content"]
-                            if content_chunk:
-                                accumulated_content += content_chunk
-                                if (
-                                    '{"tool_call"' in content_chunk
-                                    or '{ "tool_call"' in content_chunk
-                                    or '{\n  "tool_call"' in content_chunk
-                                ):
-                                    in_potential_tool_call = True
-                                    tool_call_buffer = ""
-                                if in_potential_tool_call:
-                                    tool_call_buffer += content_chunk
-                                    if self._is_complete_json_object(tool_call_buffer):
-                                        print(
-                                            f"🔧 COMPLETE TOOL CALL DETECTED - Filtering from display and executing!",
-                                        )
-                                        indicator_update = ContentUpdate(
-                                            answer_index=answer_index,
-                                            content_chunk="\n\n⚡ **Tool call detected - executing immediately...**\n",
-                                            is_done=False,
-                                            is_error=False,
-                                        )
-                                        self._put_content_update_with_retry(
-                                            indicator_update,
-                                        )
-                                        connection_id = (
-                                            f"stream_{answer_index}_{int(time.time())}"
-                                        )
-                                        self._handle_tool_calls_with_managed_connection(
-                                            accumulated_content,
-                                            answer_index,
-                                            response,
-                                            connection_id,
-                                        )
-                                        return
-                                    continue
-                                else:
-                                    chunk_to_send = content_chunk
-                                    content_update = ContentUpdate(
+                        content_chunk = fast_stream_content(line)
+                        if content_chunk is None:
+                            message = json_loads(line).get("message")
+                            content_chunk = message.get("content") if message else None
+                        if content_chunk:
+                            accumulated_content += content_chunk
+                            if (
+                                '{"tool_call"' in content_chunk
+                                or '{ "tool_call"' in content_chunk
+                                or '{\n  "tool_call"' in content_chunk
+                            ):
+                                in_potential_tool_call = True
+                                tool_call_buffer = ""
+                            if in_potential_tool_call:
+                                tool_call_buffer += content_chunk
+                                if self._is_complete_json_object(tool_call_buffer):
+                                    print(
+                                        f"🔧 COMPLETE TOOL CALL DETECTED - Filtering from display and executing!",
+                                    )
+                                    indicator_update = ContentUpdate(
                                         answer_index=answer_index,
-                                        content_chunk=chunk_to_send,
+                                        content_chunk="\n\n⚡ **Tool call detected - executing immediately...**\n",
                                         is_done=False,
                                         is_error=False,
                                     )
-                                    self._put_content_update_with_retry(content_update)
-                                    last_sent_position = len(accumulated_content)
-                        if data.get("done", False):
-                            if self.stop_streaming_flag.is_set():
+                                    self._put_content_update_with_retry(
+                                        indicator_update,
+                                    )
+                                    connection_id = (
+                                        f"stream_{answer_index}_{int(time.time())}"
+                                    )
+                                    self._handle_tool_calls_with_managed_connection(
+                                        accumulated_content,
+                                        answer_index,
+                                        response,
+                                        connection_id,
+                                    )
+                                    return
+                                continue
+                            else:
+                                put_update(
+                                    ContentUpdate(
+                                        answer_index,
+                                        content_chunk,
+                                        False,
+                                        False,
+                                    ),
+                                )
+                                last_sent_position = len(accumulated_content)
+                        # The marker can also appear in a nested object (e.g.
+                        # tool call arguments), so confirm the top-level flag
+                        if (
+                            DONE_MARKER in line or DONE_MARKER_SPACED in line
+                        ) and json_loads(line).get("done"):
+                            if stop_requested():
                                 print(
                                     f"Streaming stopped before {request_type} completion for answer {answer_index}",
                                 )
@@ -1283,15 +1272,19 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                             self._put_content_update_with_retry(done_update)
                             self._graceful_connection_close(response)
                             return
-                    except json.JSONDecodeError as json_err:
-                        print(
-                            f"Skipping malformed JSON in {request_type} stream: {line[:100]}",
-                        )
+                    except ValueError:
+                        # Malformed JSON; orjson and json decode errors both
+                        # subclass ValueError, so these are only counted
+                        skipped_chunks += 1
                         continue
                     except Exception as content_err:
-                        print(
-                            f"Error processing {request_type} content chunk: {content_err}",
-                        )
+                        # Printing a traceback per chunk stalls the stream, so
+                        # only the first failure is kept for the summary below
+                        failed_chunks += 1
+                        if first_chunk_error is None:
+                            first_chunk_error = content_err
+                        if DEBUG_STREAM:
+                            traceback.print_exc()
                         continue
             except (
                 BrokenPipeError,
@@ -1318,13 +1311,10 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
                     )
                     return
                 if not self.stop_streaming_flag.is_set():
-                    error_update = ContentUpdate(
-                        answer_index=answer_index,
-                        content_chunk=f"Connection error: {type(conn_err).__name__}",
-                        is_done=True,
-                        is_error=True,
+                    self._put_error_update(
+                        answer_index,
+                        f"Connection error: {type(conn_err).__name__}",
                     )
-                    self._put_content_update_with_retry(error_update)
                 return
             print(f"{request_type.capitalize()} stream ended without done flag")
             if (
@@ -1360,41 +1350,30 @@ class ChatTabStreamingAdvanced(ChatTabStreamingCore):
             error_msg = f"{request_type.capitalize()} request timed out"
             print(error_msg)
             if not self.stop_streaming_flag.is_set():
-                error_update = ContentUpdate(
-                    answer_index=answer_index,
-                    content_chunk=error_msg,
-                    is_done=True,
-                    is_error=True,
-                )
-                self._put_content_update_with_retry(error_update)
+                self._put_error_update(answer_index, error_msg)
         except requests.exceptions.ConnectionError:
             error_msg = (
                 f"{request_type.capitalize()} connection error - is Ollama running?"
             )
             print(error_msg)
             if not self.stop_streaming_flag.is_set():
-                error_update = ContentUpdate(
-                    answer_index=answer_index,
-                    content_chunk=error_msg,
-                    is_done=True,
-                    is_error=True,
-                )
-                self._put_content_update_with_retry(error_update)
+                self._put_error_update(answer_index, error_msg)
         except Exception as e:
             error_msg = f"Unexpected error in {request_type}: {str(e)}"
             print(error_msg)
-            import traceback
-
             traceback.print_exc()
             if not self.stop_streaming_flag.is_set():
-                error_update = ContentUpdate(
-                    answer_index=answer_index,
-                    content_chunk=error_msg,
-                    is_done=True,
-                    is_error=True,
-                )
-                self._put_content_update_with_retry(error_update)
+                self._put_error_update(answer_index, error_msg)
         finally:
+            # A tool continuation may already have installed its own stream
+            if self.active_response is response:
+                self.active_response = None
+            if skipped_chunks:
+                print(f"Skipped {skipped_chunks} malformed stream chunks")
+            if failed_chunks:
+                print(
+                    f"Error processing {failed_chunks} {request_type} content chunks, first: {first_chunk_error}",
+                )
             if response is not None and (not hasattr(self, "_connection_transferred")):
                 self._graceful_connection_close(response)
 
@@ -5,6 +5,8 @@ import re
 import threading
 import time
 import tkinter as tk
+import traceback
+from collections import deque
 from enum import Enum
 from typing import Any
 from typing import Dict
@@ -16,7 +18,14 @@ import requests
 
 from expansion_language import expand
 from tool_progress_manager import ToolProgressManager
+from utils import CONNECT_TIMEOUT
 from utils import ContentUpdate
+from utils import DONE_MARKER
+from utils import DONE_MARKER_SPACED
+from utils import fast_stream_content
+from utils import iter_ndjson_lines
+from utils import json_loads
+from utils import OLLAMA_SESSION
 
 BASE_URL: str = "http://localhost:11434/api/chat"
 
@@ -34,19 +43,42 @@ class ChatTabStreamingCore:
         update: ContentUpdate,
         max_retries: int = 3,
     ) -> bool:
-        """Put content update with retry logic."""
-        for attempt in range(max_retries):
-            try:
-                self.content_update_queue.put(update, timeout=1)
-                return True
-            except queue.Full:
-                if attempt < max_retries - 1:
-                    print(f"Queue full, retrying in {0.1 * (attempt + 1)}s...")
-                    time.sleep(0.1 * (attempt + 1))
-                else:
-                    print(f"Failed to queue update after {max_retries} attempts")
-                    return False
-        return False
+        """Put content update on the queue and wake the processor if it is idle.
+
+        The queue is an unbounded deque whose append is atomic, so this never
+        blocks or fails; max_retries is kept for existing callers.
+        """
+        self.content_update_queue.append(update)
+        if self._processor_scheduled:
+            return True
+        with self._processor_lock:
+            wake = self._queue_processor_running and not self._processor_scheduled
+            if wake:
+                self._processor_scheduled = True
+        # Scheduling from a worker thread waits on the Tk thread, so it must
+        # happen outside the lock the processor takes.
+        if wake:
+            self.parent.master.after_idle(self.process_content_queue)
+        return True
+
+    def _expand_history_question(self, question: str) -> str:
+        """Expand a prior question, reusing the result from earlier turns."""
+        expanded = self.expanded_questions_cache.get(question)
+        if expanded is None:
+            expanded = expand(question)
+            self.expanded_questions_cache[question] = expanded
+        return expanded
+
+    def clear_history_caches(self) -> None:
+        """Drop cached history messages once the chat history is replaced."""
+        self.expanded_questions_cache.clear()
+        self.turn_messages_cache.clear()
+
+    def _put_error_update(self, answer_index: int, message: str) -> None:
+        """Queue a terminal error update for the given answer."""
+        self._put_content_update_with_retry(
+            ContentUpdate(answer_index, message, is_done=True, is_error=True),
+        )
 
     def _stop_processor(self):
         """Atomically stop the queue processor."""
@@ -60,6 +92,7 @@ class ChatTabStreamingCore:
         with self._processor_lock:
             if not self._queue_processor_running:
                 self._queue_processor_running = True
+                self._processor_scheduled = True
                 print("Starting queue processor")
                 self.parent.master.after_idle(self.process_content_queue)
                 return True
@@ -170,21 +203,18 @@ class ChatTabStreamingCore:
         cleaned = cleaned[0].upper() + cleaned[1:] if cleaned else cleaned
         return cleaned
 
-    def _handle_summary_response(self, summary_queue: queue.Queue) -> None:
-        try:
-            response = summary_queue.get(timeout=30)
-            self.parent.master.after(
-                0,
-                lambda: self.parent.update_tab_name(self, response.strip()),
-            )
-        except queue.Empty:
-            self.parent.master.after(
-                0,
-                lambda: self.parent.update_tab_name(self, "Chat Summary"),
-            )
+    def _handle_summary_response(self, summary: str) -> None:
+        self.parent.master.after(
+            0,
+            lambda: self.parent.update_tab_name(self, summary.strip()),
+        )
 
-    def fetch_summary_response(self, summary_queue: queue.Queue) -> None:
-        """Fetch a summary of the conversation with retry logic and proper error handling."""
+    def fetch_summary_response(self) -> str:
+        """Fetch a summary of the conversation with retry logic and proper error handling.
+
+        Every failure path falls back to "Chat Summary", so the caller always
+        gets a tab name back.
+        """
         try:
             questions, answers, _ = self.chat_state.get_safe_copy()
             max_retries = 3
@@ -203,8 +233,7 @@ class ChatTabStreamingCore:
                     questions, answers, _ = self.chat_state.get_safe_copy()
                 else:
                     print("No valid content available for summary after retries")
-                    summary_queue.put("Chat Summary")
-                    return
+                    return "Chat Summary"
             first_q = questions[0]
             first_a = answers[0][:500]
             summary_prompt = f"Please provide a very brief summary (3-5 words) of this conversation (no period):\n\nQ: {first_q}\nA: {first_a}"
@@ -212,64 +241,64 @@ class ChatTabStreamingCore:
             selected_model = self.parent.get_selected_model()
             payload = {"model": selected_model, "messages": messages, "stream": True}
             print(f"Requesting summary with model: {selected_model}")
-            with requests.post(
+            with OLLAMA_SESSION.post(
                 BASE_URL,
                 json=payload,
                 stream=True,
-                timeout=30,
+                timeout=(CONNECT_TIMEOUT, 30),
             ) as response:
                 if response.status_code != 200:
                     error_msg = f"Summary API error: Status {response.status_code}"
                     print(f"{error_msg}\nResponse: {response.text}")
-                    summary_queue.put("Chat Summary")
-                    return
-                accumulated_summary = ""
-                done_received = False
-                for line in response.iter_lines(decode_unicode=True):
+                    return "Chat Summary"
+                summary_parts: list[str] = []
+                for line in iter_ndjson_lines(response):
                     if not line:
                         continue
                     try:
-                        data = json.loads(line.strip())
+                        # Only the final line needs a real parse for its done flag
+                        if DONE_MARKER not in line and DONE_MARKER_SPACED not in line:
+                            content_chunk = fast_stream_content(line)
+                            if content_chunk is not None:
+                                summary_parts.append(content_chunk)
+                                continue
+                        data = json_loads(line)
                         if "message" in data and "content" in data["message"]:
                             content_chunk = data["message"]["content"]
                             if content_chunk:
-                                accumulated_summary += content_chunk
+                                summary_parts.append(content_chunk)
                         if data.get("done", False):
-                            done_received = True
-                            summary = self._clean_summary(accumulated_summary)
+                            summary = self._clean_summary("".join(summary_parts))
                             print(f"Summary generated: {summary}")
-                            summary_queue.put(summary)
-                            return
-                    except json.JSONDecodeError as json_err:
+                            return summary
+                    except ValueError as json_err:
                         print(
-                            f"Failed to decode JSON line in summary: {line}. Error: {json_err}",
+                            f"Failed to decode JSON line in summary: {line!r}. Error: {json_err}",
                         )
                         continue
                     except Exception as content_err:
                         print(f"Error processing summary content chunk: {content_err}")
                         continue
-                if accumulated_summary:
-                    summary = self._clean_summary(accumulated_summary)
+                if summary_parts:
+                    summary = self._clean_summary("".join(summary_parts))
                     print(f"Summary generated (no done flag): {summary}")
-                    summary_queue.put(summary)
+                    return summary
                 else:
                     print("No summary content received")
-                    summary_queue.put("Chat Summary")
+                    return "Chat Summary"
         except requests.exceptions.Timeout:
             print("Summary request timed out")
-            summary_queue.put("Chat Summary")
+            return "Chat Summary"
         except requests.exceptions.ConnectionError:
             print("Summary connection error - is Ollama running?")
-            summary_queue.put("Chat Summary")
+            return "Chat Summary"
         except requests.exceptions.RequestException as req_err:
             print(f"Summary request error: {req_err}")
-            summary_queue.put("Chat Summary")
+            return "Chat Summary"
         except Exception as e:
             print(f"Error fetching summary: {e}")
-            import traceback
-
             traceback.print_exc()
-            summary_queue.put("Chat Summary")
+            return "Chat Summary"
 
     def _add_newlines_to_long_content(
         self,
@@ -921,16 +950,11 @@ class ChatTabStreamingCore:
             self._make_continuation_request(answer_index)
         except Exception as e:
             print(f"Error in continuation after tool calls: {e}")
-            import traceback
-
             traceback.print_exc()
-            error_update = ContentUpdate(
-                answer_index=answer_index,
-                content_chunk=f"\n\n[Error starting continuation: {str(e)}]",
-                is_done=True,
-                is_error=True,
+            self._put_error_update(
+                answer_index,
+                f"\n\n[Error starting continuation: {str(e)}]",
             )
-            self._put_content_update_with_retry(error_update)
 
     def get_summary(self) -> None:
         """Get a summary of the conversation with improved error handling and timing."""
@@ -940,9 +964,8 @@ class ChatTabStreamingCore:
         self.summary_generated = True
 
         def start_summary_generation():
-            """Start summary generation with proper timing and coordination."""
+            """Fetch the summary and hand it to the tab on one pooled worker."""
             try:
-                time.sleep(3)
                 questions, answers, _ = self.chat_state.get_safe_copy()
                 if not (
                     questions
@@ -956,20 +979,7 @@ class ChatTabStreamingCore:
                         lambda: self.parent.update_tab_name(self, "Chat Summary"),
                     )
                     return
-                summary_queue = queue.Queue()
-                fetch_thread = threading.Thread(
-                    target=self.fetch_summary_response,
-                    args=(summary_queue,),
-                    daemon=True,
-                )
-                fetch_thread.start()
-                time.sleep(0.1)
-                handler_thread = threading.Thread(
-                    target=self._handle_summary_response,
-                    args=(summary_queue,),
-                    daemon=True,
-                )
-                handler_thread.start()
+                self._handle_summary_response(self.fetch_summary_response())
             except Exception as e:
                 print(f"Error starting summary generation: {e}")
                 self.parent.master.after(
@@ -977,7 +987,11 @@ class ChatTabStreamingCore:
                     lambda: self.parent.update_tab_name(self, "Chat Summary"),
                 )
 
-        threading.Thread(target=start_summary_generation, daemon=True).start()
+        # Give the first answer a moment to settle without parking a thread
+        self.parent.master.after(
+            3000,
+            lambda: self.parent.api_executor.submit(start_summary_generation),
+        )
 
     def _extract_tool_results_from_content(
         self,
@@ -1040,8 +1054,7 @@ class ChatTabStreamingCore:
 
     def __init__(self):
         """Initialize ChatTabStreamingPart1 with all required attributes."""
-        self.content_update_queue = queue.Queue()
-        self.input_queue = queue.Queue()
+        self.content_update_queue: deque[ContentUpdate] = deque()
         self.answer_end_positions = {}
         self.stop_streaming_flag = threading.Event()
         self.is_streaming = False
@@ -1049,7 +1062,11 @@ class ChatTabStreamingCore:
         self.summary_generated = False
         self.chat_history_questions = []
         self.chat_history_answers = []
+        self.expanded_questions_cache: dict[str, str] = {}
+        self.turn_messages_cache: dict[tuple[str, str], list[dict[str, Any]]] = {}
         self._queue_processor_running = False
+        self._processor_scheduled = False
+        self._highlight_scheduled = False
         self.stream_completion_lock = threading.Lock()
         self._processor_lock = threading.Lock()
         self._pending_tool_executions = 0
@@ -1167,30 +1184,14 @@ class ChatTabStreamingCore:
                     continuation_thread.start()
                 except Exception as tool_error:
                     print(f"Error executing tool calls: {tool_error}")
-                    import traceback
-
                     traceback.print_exc()
                     error_text = f"\n\n**Tool Execution Error:** {str(tool_error)}"
-                    error_update = ContentUpdate(
-                        answer_index=answer_index,
-                        content_chunk=error_text,
-                        is_done=True,
-                        is_error=True,
-                    )
-                    self._put_content_update_with_retry(error_update)
+                    self._put_error_update(answer_index, error_text)
 
             tool_thread = threading.Thread(target=execute_and_continue, daemon=True)
             tool_thread.start()
         except Exception as e:
             print(f"Error in handle_tool_calls_and_continue: {e}")
-            import traceback
-
             traceback.print_exc()
             error_text = f"\n\n**Error:** {str(e)}"
-            error_update = ContentUpdate(
-                answer_index=answer_index,
-                content_chunk=error_text,
-                is_done=True,
-                is_error=True,
-            )
-            self._put_content_update_with_retry(error_update)
+            self._put_error_update(answer_index, error_text)
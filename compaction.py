@@ -79,6 +79,8 @@ class Compactor:
                 print("No changes made during compaction")
                 return False
 
+            # Cached request messages still hold the uncompacted answers
+            tab.clear_history_caches()
             # Update display from the now-modified ChatState
             self._update_display_from_state(tab)
             if hasattr(tab, "is_compacted"):
@@ -12,6 +12,8 @@ sips -z 256 256 alpaca.png --out MyIcon.iconset/icon_256x256.png
 sips -z 512 512 alpaca.png --out MyIcon.iconset/icon_256x256@2x.png
 sips -z 512 512 alpaca.png --out MyIcon.iconset/icon_512x512.png
 sips -z 1024 1024 alpaca.png --out MyIcon.iconset/icon_512x512@2x.png
+# Window icon loaded directly by main.py
+sips -z 32 32 alpaca.png --out alpaca_32.png
 
 iconutil -c icns MyIcon.iconset
 mv MyIcon.icns alpaca.icns
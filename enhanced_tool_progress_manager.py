@@ -6,7 +6,9 @@ from typing import Optional
 
 import requests
 
+from utils import CONNECT_TIMEOUT
 from utils import ContentUpdate
+from utils import OLLAMA_SESSION
 
 
 class ConnectionAwareToolProgressManager:
@@ -225,17 +227,17 @@ class ConnectionAwareToolProgressManager:
                 break
 
             try:
-                # Send a minimal heartbeat request using a separate session
+                # Send a minimal heartbeat request over the shared session
                 heartbeat_payload = {
                     "model": "llama3.2:1b",  # Use smallest available model
                     "messages": [{"role": "user", "content": "ping"}],
                     "stream": False,
                 }
 
-                heartbeat_response = requests.post(
+                heartbeat_response = OLLAMA_SESSION.post(
                     "http://localhost:11434/api/chat",
                     json=heartbeat_payload,
-                    timeout=10,
+                    timeout=(CONNECT_TIMEOUT, 10),
                 )
 
                 if heartbeat_response.status_code == 200:
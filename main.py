@@ -2,9 +2,6 @@ import os
 import sys
 import tkinter as tk
 
-from PIL import Image
-from PIL import ImageTk
-
 from chat_app import ChatApp
 
 
@@ -22,8 +19,18 @@ def resource_path(relative_path):
 def main() -> None:
     root = tk.Tk()
     try:
+        # alpaca_32.png is alpaca.png pre-resized by create_iconset.sh, so Tk
+        # loads it directly; resizing at startup is only a fallback
+        small_icon_path = resource_path("alpaca_32.png")
         icon_path = resource_path("alpaca.png")
-        if os.path.exists(icon_path):
+        if os.path.exists(small_icon_path):
+            photo = tk.PhotoImage(file=small_icon_path)
+            root.iconphoto(True, photo)
+            root._icon_photo = photo
+        elif os.path.exists(icon_path):
+            from PIL import Image
+            from PIL import ImageTk
+
             img = Image.open(icon_path)
             img = img.resize((32, 32), Image.Resampling.LANCZOS)
             photo = ImageTk.PhotoImage(img)
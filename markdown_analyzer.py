@@ -8,168 +8,363 @@ headings, sections, code blocks, lists, tables, and other markdown elements.
 import os
 import re
 import sys
+from collections import Counter
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
 
-
-def extract_headings(content: str) -> list[dict[str, any]]:
+ATX_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
+# Lines whose stripped text starts with "#" or consists only of = or -
+HEADING_LINE_PATTERN = re.compile(
+    r"^[^\S\n]*(?:(?P<atx>#)|(?P<underline>=+|-+)[^\S\n]*$)",
+    re.MULTILINE,
+)
+UNORDERED_ITEM_PATTERN = re.compile(r"^(\s*)([-*+])\s+(.+)$")
+ORDERED_ITEM_PATTERN = re.compile(r"^(\s*)(\d+)\. (.+)$")
+LIST_ITEM_PATTERN = re.compile(r"^\s*([-*+]|\d+\.)\s")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+TABLE_SEPARATOR_CELL_PATTERN = re.compile(r"^\s*:?-+:?\s*$")
+TABLE_SEPARATOR_START_PATTERN = re.compile(r"^\s*\|?\s*:?-+:?")
+INLINE_LINK_PATTERN = re.compile(r"(?<!!)\[([^\]]+)\]\(([^)]+)\)")
+INLINE_IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+REFERENCE_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\[([^\]]+)\]")
+REFERENCE_DEFINITION_PATTERN = re.compile(
+    r"^[^\S\n]*\[([^\]\n]+)\]:[^\S\n]*(.+)$",
+    re.MULTILINE,
+)
+
+# Summaries of recently analyzed files, keyed by file_cache_key(), oldest first
+SUMMARY_CACHE: dict[tuple, dict[str, any]] = {}
+SUMMARY_CACHE_SIZE = 32
+
+
+@dataclass(slots=True)
+class Heading:
+    """An ATX (#) or setext (underlined) heading."""
+
+    type: str
+    level: int
+    title: str
+    line_number: int
+    raw_line: str
+
+
+@dataclass(slots=True)
+class CodeBlock:
+    """A fenced or indented code block."""
+
+    type: str
+    language: str
+    start_line: int
+    content_lines: list[str]
+    end_line: int = 0
+    line_count: int = 0
+    fence_type: str = ""
+    unclosed: bool = False
+
+
+@dataclass(slots=True)
+class ListItem:
+    """One item of a list; number is only set for ordered lists."""
+
+    line_number: int
+    indent_level: int
+    content: str
+    number: int | None = None
+
+
+@dataclass(slots=True)
+class ListBlock:
+    """An ordered or unordered list; marker is only set for unordered lists."""
+
+    type: str
+    start_line: int
+    max_nesting_level: int
+    marker: str = ""
+    items: list[ListItem] = field(default_factory=list)
+    end_line: int = 0
+    item_count: int = 0
+
+
+@dataclass(slots=True)
+class Table:
+    """A pipe table: header row, |---| separator and data rows."""
+
+    type: str
+    start_line: int
+    separator_line: int
+    end_line: int
+    column_count: int
+    row_count: int
+    header: str
+    rows: list[str]
+
+
+@dataclass(slots=True)
+class Link:
+    """An inline link, reference link or reference definition."""
+
+    type: str
+    text: str = ""
+    url: str = ""
+    reference: str = ""
+    position: int | None = None
+    line_number: int | None = None
+
+
+@dataclass(slots=True)
+class Image:
+    """An inline image."""
+
+    type: str
+    alt_text: str
+    url: str
+    position: int
+
+
+def extract_headings(content: str) -> list[Heading]:
     """
     Extract all headings from markdown content.
 
+    Only lines that can start or underline a heading are visited: a single
+    multiline finditer over the content finds them, and line numbers are
+    tracked by counting the newlines skipped between matches.
+
     Args:
         content (str): Markdown content
 
     Returns:
-        List[Dict]: List of heading information
+        List[Heading]: List of heading information
     """
     headings = []
-    lines = content.split("\n")
+    line_num = 1
+    counted_to = 0
+    last_atx_line = 0
 
-    for line_num, line in enumerate(lines, 1):
-        # ATX-style headings (# ## ### etc.)
-        atx_match = re.match(r"^(#{1,6})\s+(.+)$", line.strip())
-        if atx_match:
-            level = len(atx_match.group(1))
-            title = atx_match.group(2).strip()
-            headings.append(
-                {
-                    "type": "atx_heading",
-                    "level": level,
-                    "title": title,
-                    "line_number": line_num,
-                    "raw_line": line.strip(),
-                },
-            )
-            continue
+    for match in HEADING_LINE_PATTERN.finditer(content):
+        line_start = match.start()
+        line_num += content.count("\n", counted_to, line_start)
+        counted_to = line_start
 
-        # Setext-style headings (underlined with = or -)
-        if line_num < len(lines):
-            next_line = lines[line_num] if line_num < len(lines) else ""
-            if re.match(r"^=+$", next_line.strip()) and line.strip():
-                headings.append(
-                    {
-                        "type": "setext_heading",
-                        "level": 1,
-                        "title": line.strip(),
-                        "line_number": line_num,
-                        "raw_line": line.strip(),
-                    },
-                )
-            elif re.match(r"^-+$", next_line.strip()) and line.strip():
+        # ATX-style headings (# ## ### etc.)
+        if match.lastgroup == "atx":
+            line_end = content.find("\n", line_start)
+            if line_end == -1:
+                line_end = len(content)
+            raw_line = content[line_start:line_end].strip()
+            atx_match = ATX_HEADING_PATTERN.match(raw_line)
+            if atx_match:
                 headings.append(
-                    {
-                        "type": "setext_heading",
-                        "level": 2,
-                        "title": line.strip(),
-                        "line_number": line_num,
-                        "raw_line": line.strip(),
-                    },
+                    Heading(
+                        type="atx_heading",
+                        level=len(atx_match.group(1)),
+                        title=atx_match.group(2).strip(),
+                        line_number=line_num,
+                        raw_line=raw_line,
+                    ),
                 )
+                last_atx_line = line_num
+            continue
+
+        # Setext-style headings: this line underlines the previous one with
+        # = or -, unless the previous line was already an ATX heading
+        if line_num == 1 or last_atx_line == line_num - 1:
+            continue
+        title_start = content.rfind("\n", 0, line_start - 1) + 1
+        title = content[title_start : line_start - 1].strip()
+        if title:
+            headings.append(
+                Heading(
+                    type="setext_heading",
+                    level=1 if match.group("underline")[0] == "=" else 2,
+                    title=title,
+                    line_number=line_num - 1,
+                    raw_line=title,
+                ),
+            )
 
     return headings
 
 
-def extract_code_blocks(content: str) -> list[dict[str, any]]:
+def table_summary(
+    header_line: str,
+    separator_line: int,
+    column_count: int,
+    rows: list[str],
+) -> Table:
     """
-    Extract code blocks from markdown content.
+    Build the table entry for a table whose rows have all been collected.
+
+    Args:
+        header_line (str): Stripped header row
+        separator_line (int): Line number of the |---| separator
+        column_count (int): Number of separator cells
+        rows (List[str]): Stripped data rows
+
+    Returns:
+        Table: Table information
+    """
+    row_count = 1 + len(rows)
+    return Table(
+        type="table",
+        start_line=separator_line - 1,  # Header line
+        separator_line=separator_line,
+        end_line=separator_line - 1 + row_count,
+        column_count=column_count,
+        row_count=row_count,
+        header=header_line,
+        rows=rows,
+    )
+
+
+def scan_blocks(
+    content: str,
+    lines: list[str] | None = None,
+    first_line_num: int = 1,
+) -> dict[str, any]:
+    """
+    Extract code blocks, lists and tables in a single pass over the lines.
+
+    Each kind of block keeps its own state (open fence, current list, table
+    collecting rows) and every line is handed to all three in turn.
 
     Args:
         content (str): Markdown content
+        lines (List[str], optional): content already split on newlines
+        first_line_num (int): Line number of lines[0], when scanning resumes
+            after a stable line
 
     Returns:
-        List[Dict]: List of code block information
+        Dict: Dictionary with 'code_blocks', 'lists' and 'tables' keys, plus
+            'stable_line': the last empty line after which no block was open
+            (0 if none), so a later scan can safely resume right after it
     """
     code_blocks = []
-    lines = content.split("\n")
+    lists = []
+    tables = []
+    if lines is None:
+        lines = content.split("\n")
     in_fenced_block = False
     current_block = None
-
-    for line_num, line in enumerate(lines, 1):
+    current_list = None
+    table_header = None
+    table_separator_line = 0
+    table_columns = 0
+    table_rows = []
+    previous_stripped = ""
+    stable_line = 0
+    line_num = first_line_num - 1
+
+    for line_num, line in enumerate(lines, first_line_num):
         # Fenced code blocks (``` or ~~~)
-        fenced_match = re.match(r"^(```|~~~)(.*)$", line.strip())
-        if fenced_match:
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            fence_type = stripped[:3]
             if not in_fenced_block:
                 # Starting a code block
                 in_fenced_block = True
-                language = fenced_match.group(2).strip()
-                current_block = {
-                    "type": "fenced_code_block",
-                    "language": language if language else "text",
-                    "start_line": line_num,
-                    "content_lines": [],
-                    "fence_type": fenced_match.group(1),
-                }
+                language = stripped[3:].strip()
+                current_block = CodeBlock(
+                    type="fenced_code_block",
+                    language=language if language else "text",
+                    start_line=line_num,
+                    content_lines=[],
+                    fence_type=fence_type,
+                )
             else:
                 # Ending a code block
-                if (
-                    current_block
-                    and fenced_match.group(1) == current_block["fence_type"]
-                ):
-                    current_block["end_line"] = line_num
-                    current_block["line_count"] = len(current_block["content_lines"])
+                if current_block and fence_type == current_block.fence_type:
+                    current_block.end_line = line_num
+                    current_block.line_count = len(current_block.content_lines)
                     code_blocks.append(current_block)
                     in_fenced_block = False
                     current_block = None
         elif in_fenced_block and current_block:
-            current_block["content_lines"].append(line)
+            current_block.content_lines.append(line)
 
         # Indented code blocks (4+ spaces)
-        elif re.match(r"^    ", line) and not in_fenced_block:
+        elif line.startswith("    ") and not in_fenced_block:
             # This is a simple detection - in practice, indented code blocks
             # have more complex rules about blank lines and context
             if (
                 not code_blocks
-                or code_blocks[-1]["type"] != "indented_code_block"
-                or code_blocks[-1].get("end_line", 0) < line_num - 1
+                or code_blocks[-1].type != "indented_code_block"
+                or code_blocks[-1].end_line < line_num - 1
             ):
                 code_blocks.append(
-                    {
-                        "type": "indented_code_block",
-                        "language": "text",
-                        "start_line": line_num,
-                        "content_lines": [line[4:]],  # Remove 4-space indent
-                        "end_line": line_num,
-                    },
+                    CodeBlock(
+                        type="indented_code_block",
+                        language="text",
+                        start_line=line_num,
+                        content_lines=[line[4:]],  # Remove 4-space indent
+                        end_line=line_num,
+                    ),
                 )
             else:
                 # Continue existing indented block
-                code_blocks[-1]["content_lines"].append(line[4:])
-                code_blocks[-1]["end_line"] = line_num
-
-    # Handle unclosed fenced blocks
-    if in_fenced_block and current_block:
-        current_block["end_line"] = len(lines)
-        current_block["line_count"] = len(current_block["content_lines"])
-        current_block["unclosed"] = True
-        code_blocks.append(current_block)
-
-    # Add line counts for indented blocks
-    for block in code_blocks:
-        if "line_count" not in block:
-            block["line_count"] = len(block["content_lines"])
-
-    return code_blocks
-
-
-def extract_lists(content: str) -> list[dict[str, any]]:
-    """
-    Extract lists from markdown content.
-
-    Args:
-        content (str): Markdown content
+                code_blocks[-1].content_lines.append(line[4:])
+                code_blocks[-1].end_line = line_num
+
+        # Tables: an open table collects data rows and skips blank lines;
+        # neither can be a separator, so only other lines close the table
+        # and are checked for a new separator (|---|---|)
+        if table_header is not None and not stripped:
+            pass
+        elif (
+            table_header is not None
+            and "|" in stripped
+            and not TABLE_SEPARATOR_START_PATTERN.match(stripped)
+        ):
+            table_rows.append(stripped)
+        else:
+            if table_header is not None:
+                tables.append(
+                    table_summary(
+                        table_header,
+                        table_separator_line,
+                        table_columns,
+                        table_rows,
+                    ),
+                )
+                table_header = None
 
-    Returns:
-        List[Dict]: List of list information
-    """
-    lists = []
-    lines = content.split("\n")
-    current_list = None
+            # Every separator contains a dash; skip the regex for other lines
+            if "-" in stripped and TABLE_SEPARATOR_PATTERN.match(stripped):
+                if "|" in previous_stripped:
+                    # Count columns
+                    separator_cols = len(
+                        [
+                            cell
+                            for cell in map(str.strip, stripped.split("|"))
+                            if cell and TABLE_SEPARATOR_CELL_PATTERN.match(cell)
+                        ],
+                    )
+                    if separator_cols > 0:
+                        table_header = previous_stripped
+                        table_separator_line = line_num
+                        table_columns = separator_cols
+                        table_rows = []
+        previous_stripped = stripped
+
+        # One cheap match classifies the line; the capturing item patterns
+        # only run on lines already known to look like list items
+        if not LIST_ITEM_PATTERN.match(line):
+            # Blank lines are okay in lists, anything else closes them
+            if stripped:
+                current_list = None
+            elif not (
+                line or in_fenced_block or current_list or table_header is not None
+            ):
+                stable_line = line_num
+            continue
 
-    for line_num, line in enumerate(lines, 1):
         # Unordered lists (-, *, +)
-        unordered_match = re.match(r"^(\s*)([-*+])\s+(.+)$", line)
+        unordered_match = UNORDERED_ITEM_PATTERN.match(line)
         if unordered_match:
             indent_level = (
                 len(unordered_match.group(1)) // 2
@@ -179,35 +374,34 @@ def extract_lists(content: str) -> list[dict[str, any]]:
 
             if (
                 not current_list
-                or current_list["type"] != "unordered"
-                or current_list.get("end_line", 0) < line_num - 2
+                or current_list.type != "unordered"
+                or current_list.end_line < line_num - 2
             ):
                 # Start new list
-                current_list = {
-                    "type": "unordered",
-                    "marker": marker,
-                    "start_line": line_num,
-                    "items": [],
-                    "max_nesting_level": indent_level,
-                }
+                current_list = ListBlock(
+                    type="unordered",
+                    start_line=line_num,
+                    max_nesting_level=indent_level,
+                    marker=marker,
+                )
                 lists.append(current_list)
 
-            current_list["items"].append(
-                {
-                    "line_number": line_num,
-                    "indent_level": indent_level,
-                    "content": content_text,
-                },
+            current_list.items.append(
+                ListItem(
+                    line_number=line_num,
+                    indent_level=indent_level,
+                    content=content_text,
+                ),
             )
-            current_list["end_line"] = line_num
-            current_list["max_nesting_level"] = max(
-                current_list["max_nesting_level"],
+            current_list.end_line = line_num
+            current_list.max_nesting_level = max(
+                current_list.max_nesting_level,
                 indent_level,
             )
             continue
 
         # Ordered lists (1. 2. etc.)
-        ordered_match = re.match(r"^(\s*)(\d+)\. (.+)$", line)
+        ordered_match = ORDERED_ITEM_PATTERN.match(line)
         if ordered_match:
             indent_level = len(ordered_match.group(1)) // 2
             number = int(ordered_match.group(2))
@@ -215,114 +409,118 @@ def extract_lists(content: str) -> list[dict[str, any]]:
 
             if (
                 not current_list
-                or current_list["type"] != "ordered"
-                or current_list.get("end_line", 0) < line_num - 2
+                or current_list.type != "ordered"
+                or current_list.end_line < line_num - 2
             ):
                 # Start new list
-                current_list = {
-                    "type": "ordered",
-                    "start_line": line_num,
-                    "items": [],
-                    "max_nesting_level": indent_level,
-                }
+                current_list = ListBlock(
+                    type="ordered",
+                    start_line=line_num,
+                    max_nesting_level=indent_level,
+                )
                 lists.append(current_list)
 
-            current_list["items"].append(
-                {
-                    "line_number": line_num,
-                    "indent_level": indent_level,
-                    "number": number,
-                    "content": content_text,
-                },
+            current_list.items.append(
+                ListItem(
+                    line_number=line_num,
+                    indent_level=indent_level,
+                    content=content_text,
+                    number=number,
+                ),
             )
-            current_list["end_line"] = line_num
-            current_list["max_nesting_level"] = max(
-                current_list["max_nesting_level"],
+            current_list.end_line = line_num
+            current_list.max_nesting_level = max(
+                current_list.max_nesting_level,
                 indent_level,
             )
-            continue
 
-        # If we hit a non-list line, close current list if it exists
-        if current_list and line.strip() == "":
-            continue  # Blank lines are okay in lists
-        elif current_list and not re.match(r"^\s*([-*+]|\d+\.)\s", line):
-            current_list = None
+    # Handle unclosed fenced blocks
+    if in_fenced_block and current_block:
+        current_block.end_line = line_num
+        current_block.line_count = len(current_block.content_lines)
+        current_block.unclosed = True
+        code_blocks.append(current_block)
+
+    # Add line counts for indented blocks
+    for block in code_blocks:
+        if block.type == "indented_code_block":
+            block.line_count = len(block.content_lines)
 
     # Add item counts
     for list_item in lists:
-        list_item["item_count"] = len(list_item["items"])
+        list_item.item_count = len(list_item.items)
+
+    # A table running to the end of the document
+    if table_header is not None:
+        tables.append(
+            table_summary(
+                table_header,
+                table_separator_line,
+                table_columns,
+                table_rows,
+            ),
+        )
+
+    return {
+        "code_blocks": code_blocks,
+        "lists": lists,
+        "tables": tables,
+        "stable_line": stable_line,
+    }
+
+
+def extract_code_blocks(
+    content: str,
+    lines: list[str] | None = None,
+) -> list[CodeBlock]:
+    """
+    Extract code blocks from markdown content.
+
+    Args:
+        content (str): Markdown content
+        lines (List[str], optional): content already split on newlines
 
-    return lists
+    Returns:
+        List[CodeBlock]: List of code block information
+    """
+    return scan_blocks(content, lines)["code_blocks"]
+
+
+def extract_lists(
+    content: str,
+    lines: list[str] | None = None,
+) -> list[ListBlock]:
+    """
+    Extract lists from markdown content.
+
+    Args:
+        content (str): Markdown content
+        lines (List[str], optional): content already split on newlines
+
+    Returns:
+        List[ListBlock]: List of list information
+    """
+    return scan_blocks(content, lines)["lists"]
 
 
-def extract_tables(content: str) -> list[dict[str, any]]:
+def extract_tables(
+    content: str,
+    lines: list[str] | None = None,
+) -> list[Table]:
     """
     Extract tables from markdown content.
 
     Args:
         content (str): Markdown content
+        lines (List[str], optional): content already split on newlines
 
     Returns:
-        List[Dict]: List of table information
+        List[Table]: List of table information
     """
-    tables = []
-    lines = content.split("\n")
+    return scan_blocks(content, lines)["tables"]
 
-    for line_num, line in enumerate(lines, 1):
-        # Look for table separator lines (|---|---|)
-        if re.match(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$", line.strip()):
-            # This might be a table separator
-            if line_num > 1:
-                header_line = lines[line_num - 2].strip()
-                if "|" in header_line:
-                    # Count columns
-                    separator_cols = len(
-                        [
-                            col
-                            for col in line.split("|")
-                            if col.strip() and re.match(r"^\s*:?-+:?\s*$", col.strip())
-                        ],
-                    )
-                    header_cols = len(
-                        [col for col in header_line.split("|") if col.strip()],
-                    )
 
-                    if separator_cols > 0:
-                        # Find all rows of this table
-                        table_rows = [header_line]
-                        row_count = 1
-
-                        # Look for data rows after the separator
-                        for next_line_idx in range(line_num, len(lines)):
-                            next_line = lines[next_line_idx].strip()
-                            if "|" in next_line and not re.match(
-                                r"^\s*\|?\s*:?-+:?",
-                                next_line,
-                            ):
-                                table_rows.append(next_line)
-                                row_count += 1
-                            elif next_line == "":
-                                continue  # Skip blank lines
-                            else:
-                                break  # End of table
-
-                        tables.append(
-                            {
-                                "type": "table",
-                                "start_line": line_num - 1,  # Header line
-                                "separator_line": line_num,
-                                "end_line": line_num - 1 + row_count,
-                                "column_count": separator_cols,
-                                "row_count": row_count,
-                                "header": header_line,
-                                "rows": table_rows[1:] if len(table_rows) > 1 else [],
-                            },
-                        )
-
-    return tables
-
-
-def extract_links_and_images(content: str) -> dict[str, list[dict[str, any]]]:
+def extract_links_and_images(content: str) -> dict[str, list[Link] | list[Image]]:
     """
     Extract links and images from markdown content.
 
@@ -336,98 +534,148 @@ def extract_links_and_images(content: str) -> dict[str, list[dict[str, any]]]:
     images = []
 
     # Regular links [text](url)
-    link_pattern = r"(?<!!)\[([^\]]+)\]\(([^)]+)\)"
-    for match in re.finditer(link_pattern, content):
+    for match in INLINE_LINK_PATTERN.finditer(content):
         links.append(
-            {
-                "type": "inline_link",
-                "text": match.group(1),
-                "url": match.group(2),
-                "position": match.start(),
-            },
+            Link(
+                type="inline_link",
+                text=match.group(1),
+                url=match.group(2),
+                position=match.start(),
+            ),
         )
 
     # Images ![alt](url)
-    image_pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
-    for match in re.finditer(image_pattern, content):
+    for match in INLINE_IMAGE_PATTERN.finditer(content):
         images.append(
-            {
-                "type": "inline_image",
-                "alt_text": match.group(1),
-                "url": match.group(2),
-                "position": match.start(),
-            },
+            Image(
+                type="inline_image",
+                alt_text=match.group(1),
+                url=match.group(2),
+                position=match.start(),
+            ),
         )
 
     # Reference links [text][ref]
-    ref_link_pattern = r"\[([^\]]+)\]\[([^\]]+)\]"
-    for match in re.finditer(ref_link_pattern, content):
+    for match in REFERENCE_LINK_PATTERN.finditer(content):
         links.append(
-            {
-                "type": "reference_link",
-                "text": match.group(1),
-                "reference": match.group(2),
-                "position": match.start(),
-            },
+            Link(
+                type="reference_link",
+                text=match.group(1),
+                reference=match.group(2),
+                position=match.start(),
+            ),
         )
 
-    # Reference definitions [ref]: url
-    ref_def_pattern = r"^\s*\[([^\]]+)\]:\s*(.+)$"
-    for line_num, line in enumerate(content.split("\n"), 1):
-        match = re.match(ref_def_pattern, line)
-        if match:
-            links.append(
-                {
-                    "type": "reference_definition",
-                    "reference": match.group(1),
-                    "url": match.group(2).strip(),
-                    "line_number": line_num,
-                },
-            )
+    # Reference definitions [ref]: url, one per line
+    line_num = 1
+    counted_to = 0
+    for match in REFERENCE_DEFINITION_PATTERN.finditer(content):
+        line_num += content.count("\n", counted_to, match.start())
+        counted_to = match.start()
+        links.append(
+            Link(
+                type="reference_definition",
+                reference=match.group(1),
+                url=match.group(2).strip(),
+                line_number=line_num,
+            ),
+        )
 
     return {"links": links, "images": images}
 
 
+def summarize_content(
+    content: str,
+    blocks: dict[str, any] | None = None,
+) -> dict[str, any]:
+    """
+    Extract structural information from markdown content.
+
+    Args:
+        content (str): Markdown content
+        blocks (Dict, optional): scan_blocks result for content, when the
+            caller already has it
+
+    Returns:
+        Dict: Dictionary containing markdown structure information
+    """
+    # Split once and share the lines with every line-based extractor
+    lines = content.split("\n")
+
+    # Extract all structural elements
+    headings = extract_headings(content)
+    if blocks is None:
+        blocks = scan_blocks(content, lines)
+    code_blocks = blocks["code_blocks"]
+    lists = blocks["lists"]
+    tables = blocks["tables"]
+    links_and_images = extract_links_and_images(content)
+
+    # Calculate some statistics
+    word_count = len(content.split())
+    char_count = len(content)
+    # Blank lines are empty or whitespace-only; both counts run in C rather
+    # than stripping every line
+    blank_lines = lines.count("") + len(list(filter(str.isspace, lines)))
+
+    return {
+        "headings": headings,
+        "code_blocks": code_blocks,
+        "lists": lists,
+        "tables": tables,
+        "links": links_and_images["links"],
+        "images": links_and_images["images"],
+        "statistics": {
+            "line_count": len(lines),
+            "word_count": word_count,
+            "character_count": char_count,
+            "non_empty_lines": len(lines) - blank_lines,
+        },
+    }
+
+
+def file_cache_key(filename: str) -> tuple | None:
+    """
+    Identify the current version of a file for SUMMARY_CACHE.
+
+    Args:
+        filename (str): Path to the file
+
+    Returns:
+        Tuple: (filename, absolute path, mtime in ns, size), or None if the
+            file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (filename, os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+
 def summarize_file(filename: str) -> dict[str, any]:
     """
     Analyze a Markdown file and extract structural information.
 
+    Results are cached per file version, so repeated calls on an unchanged
+    file skip reading and parsing it again.
+
     Args:
         filename (str): Path to the Markdown file to analyze
 
     Returns:
         Dict: Dictionary containing markdown structure information
     """
+    key = file_cache_key(filename)
+    entry = SUMMARY_CACHE.pop(key, None)
+    if entry is not None:
+        SUMMARY_CACHE[key] = entry
+        return entry["results"]
+
     try:
         with open(filename, encoding="utf-8") as f:
             content = f.read()
 
-        # Extract all structural elements
-        headings = extract_headings(content)
-        code_blocks = extract_code_blocks(content)
-        lists = extract_lists(content)
-        tables = extract_tables(content)
-        links_and_images = extract_links_and_images(content)
-
-        # Calculate some statistics
-        lines = content.split("\n")
-        word_count = len(content.split())
-        char_count = len(content)
-
-        return {
-            "headings": headings,
-            "code_blocks": code_blocks,
-            "lists": lists,
-            "tables": tables,
-            "links": links_and_images["links"],
-            "images": links_and_images["images"],
-            "statistics": {
-                "line_count": len(lines),
-                "word_count": word_count,
-                "character_count": char_count,
-                "non_empty_lines": len([line for line in lines if line.strip()]),
-            },
-        }
+        results = summarize_content(content)
 
     except FileNotFoundError:
         return {"error": f"File '{filename}' not found."}
@@ -438,6 +686,81 @@ def summarize_file(filename: str) -> dict[str, any]:
     except Exception as e:
         return {"error": f"Error analyzing '{filename}': {e}"}
 
+    if key is not None:
+        SUMMARY_CACHE[key] = {"results": results}
+        if len(SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+            del SUMMARY_CACHE[next(iter(SUMMARY_CACHE))]
+    return results
+
+
+class IncrementalAnalyzer:
+    """
+    Analyze a markdown buffer that keeps growing, e.g. a streamed response.
+
+    Code blocks, lists and tables that closed before the last stable line
+    (an empty line with no block open) are final, so each feed() only
+    rescans the lines after it. Anything still open, such as a "Text\n-"
+    tail that may turn into a heading or a list, is rescanned from scratch
+    once more text arrives. Headings, links and statistics come from
+    regex and str methods over the whole buffer.
+    """
+
+    def __init__(self) -> None:
+        self.content = ""
+        self.stable_line = 0
+        self.stable_offset = 0
+        self.stable_blocks: dict[str, list] = {
+            "code_blocks": [],
+            "lists": [],
+            "tables": [],
+        }
+
+    def feed(self, text: str) -> dict[str, any]:
+        """Append text to the buffer and return the analysis of all of it."""
+        self.content += text
+        return self.analyze()
+
+    def analyze(self) -> dict[str, any]:
+        """Return the same structure summarize_content would for the buffer."""
+        lines = self.content[self.stable_offset :].split("\n")
+        tail = scan_blocks(self.content, lines, self.stable_line + 1)
+        blocks = {
+            kind: self.stable_blocks[kind] + tail[kind] for kind in self.stable_blocks
+        }
+
+        # Move the checkpoint forward, but never onto the unterminated last
+        # line: more text may still be appended to it
+        stable_line = tail["stable_line"]
+        if stable_line and stable_line < self.stable_line + len(lines):
+            stable_count = stable_line - self.stable_line
+            self.stable_offset += (
+                sum(len(line) for line in lines[:stable_count]) + stable_count
+            )
+            self.stable_line = stable_line
+            for kind, found in self.stable_blocks.items():
+                found.extend(
+                    block for block in tail[kind] if block.start_line < stable_line
+                )
+
+        return summarize_content(self.content, blocks)
+
+    def snapshot(self) -> tuple:
+        """Capture the buffer and checkpoint so they can be restored later."""
+        return (
+            self.content,
+            self.stable_line,
+            self.stable_offset,
+            {kind: list(found) for kind, found in self.stable_blocks.items()},
+        )
+
+    def restore(self, state: tuple) -> None:
+        """Return to a state captured by snapshot()."""
+        content, self.stable_line, self.stable_offset, stable_blocks = state
+        self.content = content
+        self.stable_blocks = {
+            kind: list(found) for kind, found in stable_blocks.items()
+        }
+
 
 def format_results(results: dict[str, any], filename: str) -> str:
     """
@@ -465,22 +788,19 @@ def format_results(results: dict[str, any], filename: str) -> str:
 
     if headings:
         # Group by level
-        by_level = {}
+        by_level = defaultdict(list)
         for heading in headings:
-            level = heading["level"]
-            if level not in by_level:
-                by_level[level] = []
-            by_level[level].append(heading)
+            by_level[heading.level].append(heading)
 
-        for level in sorted(by_level.keys()):
+        for level in sorted(by_level):
             level_headings = by_level[level]
             output_lines.append(
                 f"   Level {level} ({'#' * level}) - {len(level_headings)} headings:",
             )
-            for heading in level_headings:
-                output_lines.append(
-                    f"     - {heading['title']} (line {heading['line_number']})",
-                )
+            output_lines.extend(
+                f"     - {heading.title} (line {heading.line_number})"
+                for heading in level_headings
+            )
     else:
         output_lines.append("   (No headings found)")
 
@@ -489,32 +809,28 @@ def format_results(results: dict[str, any], filename: str) -> str:
     output_lines.append(f"\n💻 Code Blocks ({len(code_blocks)} total):")
 
     if code_blocks:
-        fenced_blocks = [cb for cb in code_blocks if cb["type"] == "fenced_code_block"]
-        indented_blocks = [
-            cb for cb in code_blocks if cb["type"] == "indented_code_block"
-        ]
+        fenced_blocks = [cb for cb in code_blocks if cb.type == "fenced_code_block"]
+        indented_blocks = [cb for cb in code_blocks if cb.type == "indented_code_block"]
 
         if fenced_blocks:
             output_lines.append(f"   Fenced Code Blocks ({len(fenced_blocks)}):")
-            lang_counts = {}
-            for block in fenced_blocks:
-                lang = block["language"]
-                lang_counts[lang] = lang_counts.get(lang, 0) + 1
-                unclosed_marker = " (unclosed)" if block.get("unclosed") else ""
-                output_lines.append(
-                    f"     - {lang}: {block['line_count']} lines (lines {block['start_line']}-{block['end_line']}){unclosed_marker}",
-                )
+            output_lines.extend(
+                f"     - {block.language}: {block.line_count} lines (lines {block.start_line}-{block.end_line})"
+                + (" (unclosed)" if block.unclosed else "")
+                for block in fenced_blocks
+            )
 
+            lang_counts = Counter(block.language for block in fenced_blocks)
             output_lines.append(
                 f"   Languages used: {', '.join(f'{lang} ({count})' for lang, count in sorted(lang_counts.items()))}",
             )
 
         if indented_blocks:
             output_lines.append(f"   Indented Code Blocks ({len(indented_blocks)}):")
-            for block in indented_blocks:
-                output_lines.append(
-                    f"     - {block['line_count']} lines (lines {block['start_line']}-{block['end_line']})",
-                )
+            output_lines.extend(
+                f"     - {block.line_count} lines (lines {block.start_line}-{block.end_line})"
+                for block in indented_blocks
+            )
     else:
         output_lines.append("   (No code blocks found)")
 
@@ -523,22 +839,22 @@ def format_results(results: dict[str, any], filename: str) -> str:
     output_lines.append(f"\n📝 Lists ({len(lists)} total):")
 
     if lists:
-        ordered_lists = [l for l in lists if l["type"] == "ordered"]
-        unordered_lists = [l for l in lists if l["type"] == "unordered"]
+        ordered_lists = [l for l in lists if l.type == "ordered"]
+        unordered_lists = [l for l in lists if l.type == "unordered"]
 
         if ordered_lists:
             output_lines.append(f"   Ordered Lists ({len(ordered_lists)}):")
-            for lst in ordered_lists:
-                output_lines.append(
-                    f"     - {lst['item_count']} items, max nesting level {lst['max_nesting_level']} (lines {lst['start_line']}-{lst['end_line']})",
-                )
+            output_lines.extend(
+                f"     - {lst.item_count} items, max nesting level {lst.max_nesting_level} (lines {lst.start_line}-{lst.end_line})"
+                for lst in ordered_lists
+            )
 
         if unordered_lists:
             output_lines.append(f"   Unordered Lists ({len(unordered_lists)}):")
-            for lst in unordered_lists:
-                output_lines.append(
-                    f"     - {lst['item_count']} items, marker '{lst['marker']}', max nesting level {lst['max_nesting_level']} (lines {lst['start_line']}-{lst['end_line']})",
-                )
+            output_lines.extend(
+                f"     - {lst.item_count} items, marker '{lst.marker}', max nesting level {lst.max_nesting_level} (lines {lst.start_line}-{lst.end_line})"
+                for lst in unordered_lists
+            )
     else:
         output_lines.append("   (No lists found)")
 
@@ -547,10 +863,10 @@ def format_results(results: dict[str, any], filename: str) -> str:
     output_lines.append(f"\n📊 Tables ({len(tables)} total):")
 
     if tables:
-        for i, table in enumerate(tables, 1):
-            output_lines.append(
-                f"   Table {i}: {table['column_count']} columns × {table['row_count']} rows (lines {table['start_line']}-{table['end_line']})",
-            )
+        output_lines.extend(
+            f"   Table {i}: {table.column_count} columns × {table.row_count} rows (lines {table.start_line}-{table.end_line})"
+            for i, table in enumerate(tables, 1)
+        )
     else:
         output_lines.append("   (No tables found)")
 
@@ -559,11 +875,7 @@ def format_results(results: dict[str, any], filename: str) -> str:
     output_lines.append(f"\n🔗 Links ({len(links)} total):")
 
     if links:
-        link_types = {}
-        for link in links:
-            link_type = link["type"]
-            link_types[link_type] = link_types.get(link_type, 0) + 1
-
+        link_types = Counter(link.type for link in links)
         for link_type, count in sorted(link_types.items()):
             output_lines.append(f"   {link_type.replace('_', ' ').title()}: {count}")
     else:
@@ -574,23 +886,25 @@ def format_results(results: dict[str, any], filename: str) -> str:
     output_lines.append(f"\n🖼️  Images ({len(images)} total):")
 
     if images:
-        for i, image in enumerate(images, 1):
-            alt_text = (
-                f" (alt: '{image['alt_text']}')"
-                if image["alt_text"]
-                else " (no alt text)"
-            )
-            output_lines.append(f"   Image {i}: {image['url']}{alt_text}")
+        output_lines.extend(
+            f"   Image {i}: {image.url}"
+            + (f" (alt: '{image.alt_text}')" if image.alt_text else " (no alt text)")
+            for i, image in enumerate(images, 1)
+        )
     else:
         output_lines.append("   (No images found)")
 
     # Format statistics
     stats = results["statistics"]
-    output_lines.append(f"\n📊 Document Statistics:")
-    output_lines.append(f"   - Total lines: {stats['line_count']}")
-    output_lines.append(f"   - Non-empty lines: {stats['non_empty_lines']}")
-    output_lines.append(f"   - Word count: {stats['word_count']}")
-    output_lines.append(f"   - Character count: {stats['character_count']}")
+    output_lines.extend(
+        [
+            f"\n📊 Document Statistics:",
+            f"   - Total lines: {stats['line_count']}",
+            f"   - Non-empty lines: {stats['non_empty_lines']}",
+            f"   - Word count: {stats['word_count']}",
+            f"   - Character count: {stats['character_count']}",
+        ],
+    )
 
     # Summary
     total_structural_elements = (
@@ -601,16 +915,19 @@ def format_results(results: dict[str, any], filename: str) -> str:
         + len(links)
         + len(images)
     )
-    output_lines.append(f"\n📋 Summary:")
-    output_lines.append(f"   - Headings: {len(headings)}")
-    output_lines.append(f"   - Code blocks: {len(code_blocks)}")
-    output_lines.append(f"   - Lists: {len(lists)}")
-    output_lines.append(f"   - Tables: {len(tables)}")
-    output_lines.append(f"   - Links: {len(links)}")
-    output_lines.append(f"   - Images: {len(images)}")
-    output_lines.append(f"   - Total structural elements: {total_structural_elements}")
-
-    output_lines.append("\n" + "=" * 80)
+    output_lines.extend(
+        [
+            f"\n📋 Summary:",
+            f"   - Headings: {len(headings)}",
+            f"   - Code blocks: {len(code_blocks)}",
+            f"   - Lists: {len(lists)}",
+            f"   - Tables: {len(tables)}",
+            f"   - Links: {len(links)}",
+            f"   - Images: {len(images)}",
+            f"   - Total structural elements: {total_structural_elements}",
+            "\n" + "=" * 80,
+        ],
+    )
 
     return "\n".join(output_lines)
 
@@ -626,16 +943,54 @@ def analyze_markdown_file(filename: str) -> str:
         str: Formatted analysis results
     """
     results = summarize_file(filename)
-    return format_results(results, filename)
+
+    # Reuse the formatted text for an unchanged file as well
+    entry = SUMMARY_CACHE.get(file_cache_key(filename))
+    if entry is None:
+        return format_results(results, filename)
+    if "formatted" not in entry:
+        entry["formatted"] = format_results(entry["results"], filename)
+    return entry["formatted"]
+
+
+def analyze_many(filenames: list[str], workers: int | None = None) -> dict[str, str]:
+    """
+    Analyze several Markdown files in parallel worker processes.
+
+    Parsing is CPU-bound, so threads would serialize on the GIL; each worker
+    process analyzes its share of the files and only the formatted text is
+    sent back.
+
+    Args:
+        filenames (List[str]): Paths to the Markdown files to analyze
+        workers (int, optional): Number of worker processes, defaulting to
+            the CPU count
+
+    Returns:
+        Dict: Formatted analysis results keyed by filename
+    """
+    if len(filenames) < 2:
+        return {filename: analyze_markdown_file(filename) for filename in filenames}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(
+            zip(
+                filenames,
+                executor.map(analyze_markdown_file, filenames, chunksize=8),
+            ),
+        )
 
 
 def main():
     """
     Main function to handle command line arguments and run the analysis.
     """
-    if len(sys.argv) != 2:
-        print("Usage: python markdown_analyzer.py <markdown_file>")
+    if len(sys.argv) < 2:
+        print(
+            "Usage: python markdown_analyzer.py <markdown_file> [<markdown_file> ...]",
+        )
         print("Example: python markdown_analyzer.py README.md")
+        print("Several files are analyzed in parallel processes.")
         print("\nThis tool will show:")
         print("  - Headings structure and hierarchy")
         print("  - Code blocks (fenced and indented) with languages")
@@ -645,21 +1000,23 @@ def main():
         print("  - Document statistics")
         sys.exit(1)
 
-    filename = sys.argv[1]
+    filenames = sys.argv[1:]
 
-    # Check if file exists
-    if not os.path.exists(filename):
-        print(f"Error: File '{filename}' does not exist.")
-        sys.exit(1)
+    for filename in filenames:
+        # Check if file exists
+        if not os.path.exists(filename):
+            print(f"Error: File '{filename}' does not exist.")
+            sys.exit(1)
 
-    if not filename.lower().endswith((".md", ".markdown")):
-        print(
-            f"Warning: '{filename}' doesn't have a .md or .markdown extension. Proceeding anyway...",
-        )
+        if not filename.lower().endswith((".md", ".markdown")):
+            print(
+                f"Warning: '{filename}' doesn't have a .md or .markdown extension. Proceeding anyway...",
+            )
 
-    # Analyze the file and print results
-    result_string = analyze_markdown_file(filename)
-    print(result_string)
+    # Analyze the files and print results in the order given
+    results = analyze_many(filenames)
+    for filename in filenames:
+        print(results[filename])
 
 
 if __name__ == "__main__":
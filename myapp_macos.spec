@@ -9,6 +9,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('alpaca.png', '.'),  # Include PNG icon
+        ('alpaca_32.png', '.'),  # Pre-resized window icon
         ('alpaca.icns', '.'), # Include ICNS icon if you have it
     ],
     hiddenimports=['PIL', 'PIL._tkinter_finder', 'PIL.Image', 'PIL.ImageTk'],
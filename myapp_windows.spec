@@ -9,6 +9,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('alpaca.png', '.'),  # Include PNG icon
+        ('alpaca_32.png', '.'),  # Pre-resized window icon
     ],
     hiddenimports=[],
     hookspath=[],
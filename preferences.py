@@ -1,8 +1,14 @@
 import tkinter as tk
+from tkinter import messagebox
 from tkinter import ttk
 from typing import Any
 from typing import List
 
+import requests
+
+from utils import CONNECT_TIMEOUT
+from utils import OLLAMA_SESSION
+
 DEFAULT_PREFERENCES = {
     "api_url": "http://localhost:11434/api/chat",
     "default_model": "granite-code:8b",
@@ -232,9 +238,9 @@ class PreferencesWindow:
         """Test the API connection with current settings."""
         test_url = self.api_url_var.get()
         try:
-            response = requests.get(
+            response = OLLAMA_SESSION.get(
                 test_url.replace("/api/chat", "/api/tags"),
-                timeout=5,
+                timeout=(CONNECT_TIMEOUT, 5),
             )
             if response.status_code == 200:
                 messagebox.showinfo("Connection Test", "Connection successful!")
@@ -1,5 +1,6 @@
 import sys
 import tkinter as tk
+from functools import lru_cache
 from tkinter import scrolledtext
 from typing import Optional
 from typing import Tuple
@@ -16,6 +17,22 @@ from text_utils import count_leading_chars
 from text_utils import parse_code_blocks
 from token_cache import TokenCache
 
+# Lexers are stateless between get_tokens calls, so every widget shares one.
+MARKDOWN_LEXER = MarkdownLexer()
+
+
+@lru_cache(maxsize=None)
+def load_style(theme_name: str):
+    """Look up a Pygments style, falling back to "default" or any installed one."""
+    try:
+        return get_style_by_name(theme_name)
+    except:
+        try:
+            return get_style_by_name("default")
+        except:
+            available_themes = list(get_all_styles())
+            return get_style_by_name(available_themes[0]) if available_themes else None
+
 
 def is_macos() -> bool:
     return sys.platform == "darwin"
@@ -135,20 +152,7 @@ class SyntaxHighlightedText(SyntaxHighlightingMixin, scrolledtext.ScrolledText):
     def update_theme(self, theme_name: str) -> None:
         """Update the syntax highlighting theme."""
         try:
-            try:
-                style = get_style_by_name(theme_name)
-            except:
-                try:
-                    style = get_style_by_name("default")
-                except:
-                    from pygments.styles import get_all_styles
-
-                    available_themes = list(get_all_styles())
-                    style = (
-                        get_style_by_name(available_themes[0])
-                        if available_themes
-                        else None
-                    )
+            style = load_style(theme_name)
             if style is None:
                 print(f"Could not load any theme, keeping current theme")
                 return
@@ -173,7 +177,7 @@ class SyntaxHighlightedText(SyntaxHighlightingMixin, scrolledtext.ScrolledText):
         if self.highlighting_enabled:
             if self.after_id:
                 self.after_cancel(self.after_id)
-            self.after_id = self.after(50, self.highlight_text)
+            self.after_id = self.after(150, self.highlight_text)
 
     def set_highlighting_enabled(self, enabled: bool) -> None:
         """Enable or disable automatic syntax highlighting."""
@@ -203,24 +207,16 @@ class SyntaxHighlightedText(SyntaxHighlightingMixin, scrolledtext.ScrolledText):
     ) -> None:
         kwargs.pop("wrap", None)
         super().__init__(*args, **kwargs)
-        self.lexer = MarkdownLexer()
+        self.lexer = MARKDOWN_LEXER
         self.token_cache = TokenCache(max_size=50)
+        self.syntax_tags: set[str] = set()
         self.last_highlighted_content = ""
         self.last_highlighted_length = 0
         self.highlighting_in_progress = False
+        self.highlight_generation = 0
+        self.background_highlight_pending = False
         self.skip_highlighting_reason = None
-        try:
-            self.style = get_style_by_name(theme_name)
-        except:
-            try:
-                self.style = get_style_by_name("default")
-            except:
-                from pygments.styles import get_all_styles
-
-                available_themes = list(get_all_styles())
-                self.style = (
-                    get_style_by_name(available_themes[0]) if available_themes else None
-                )
+        self.style = load_style(theme_name)
         if background_color == "black":
             self.bg_color = "#000000"
             self.fg_color = "#f8f8f2"
@@ -242,6 +238,7 @@ class SyntaxHighlightedText(SyntaxHighlightingMixin, scrolledtext.ScrolledText):
         self.bind("<Tab>", self.insert_tab_spaces)
         self.after_id: str | None = None
         self.tag_configure("separator", foreground="#888888")
+        self.tag_configure("highlight", background="yellow", foreground="black")
         if self.style and hasattr(self.style, "styles") and self.style.styles:
             self.configure_initial_theme_tags()
         self.bind("<Control-z>", self.undo)
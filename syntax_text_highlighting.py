@@ -1,4 +1,7 @@
+import concurrent.futures
 import tkinter as tk
+import traceback
+from functools import lru_cache
 from typing import Optional
 from typing import Tuple
 from typing import Union
@@ -7,9 +10,200 @@ from pygments.styles import get_all_styles  # type: ignore
 from pygments.styles import get_style_by_name  # type: ignore
 
 from text_utils import backoff
+from text_utils import CODE_FENCE_PATTERN
 from text_utils import count_leading_chars
 from text_utils import parse_code_blocks
 
+CHANGE_SCAN_BLOCK = 4096
+# Lexing is pure Python, so the worker cannot run it in parallel with the UI,
+# but Tk keeps handling events between GIL switches instead of freezing for
+# the whole lex of a long chat.
+BACKGROUND_LEX_THRESHOLD = 20000
+HIGHLIGHT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="highlight",
+)
+# Tag names by Pygments token type; str() on a token type rebuilds the dotted
+# name on every call, and the set of token types is small and fixed.
+TOKEN_TAG_NAMES: dict = {}
+
+
+def make_color_more_blue(color: str) -> str:
+    """Make a color more blue-ish by increasing the blue component."""
+    try:
+        if color.lower() == "#000000":
+            return "#4444dd"
+        # Parse hex color
+        if color.startswith("#"):
+            hex_color = color[1:]
+
+            # Handle both 3 and 6 character hex codes
+            if len(hex_color) == 3:
+                r = int(hex_color[0] * 2, 16)
+                g = int(hex_color[1] * 2, 16)
+                b = int(hex_color[2] * 2, 16)
+            elif len(hex_color) == 6:
+                r = int(hex_color[0:2], 16)
+                g = int(hex_color[2:4], 16)
+                b = int(hex_color[4:6], 16)
+            else:
+                return color
+
+            # Increase blue component and slightly decrease red/green
+            # This creates a more noticeable blue tint
+            r = max(0, int(r * 0.7))  # Reduce red by 30%
+            g = max(0, int(g * 0.7))  # Reduce green by 30%
+            b = min(255, int(b * 1.5) + 80)  # Increase blue by 50% and add 80
+
+            # Return new color
+            return f"#{r:02x}{g:02x}{b:02x}"
+
+    except Exception as e:
+        print(f"Error making color more blue: {e}")
+
+    return color
+
+
+def parse_style(
+    style: str | dict[str, str],
+    default_fg: str,
+) -> tuple[str, str | None]:
+    fg: str | None = None
+    bg: str | None = None
+
+    if isinstance(style, str):
+        parts = style.split()
+        for part in parts:
+            part = part.strip()
+            if part.startswith("bg:"):
+                bg = part.split("bg:")[1]
+            elif part.startswith("border:"):
+                # Skip border properties as Tkinter doesn't support them
+                continue
+            elif part.startswith("#"):
+                # This is a color hex code
+                fg = part
+            elif part in ["bold", "italic", "underline"]:
+                # Handle text formatting (could be extended later)
+                continue
+            elif part.startswith("color:"):
+                # Handle CSS-style color property
+                fg = part.split("color:")[1]
+            elif part.startswith("background:") or part.startswith(
+                "background-color:",
+            ):
+                # Handle CSS-style background property
+                bg = part.split(":")[-1]
+
+    elif isinstance(style, dict):
+        fg = style.get("color")
+        bg = style.get("bgcolor")
+
+    # Set default foreground color if not found
+    if not fg:
+        fg = default_fg
+
+    # Validate colors - ensure they start with # and are valid hex
+    if fg and not fg.startswith("#"):
+        if fg.startswith("color:"):
+            fg = fg.split("color:")[-1]
+        # If it's still not a valid hex color, use default
+        if not (
+            fg.startswith("#")
+            and len(fg) in [4, 7]
+            and all(c in "0123456789abcdefABCDEF" for c in fg[1:])
+        ):
+            fg = "#ffffff"
+
+    if bg and not bg.startswith("#"):
+        if bg.startswith("bg:"):
+            bg = bg.split("bg:")[-1]
+        # If it's not a valid hex color, ignore it
+        if not (
+            bg.startswith("#")
+            and len(bg) in [4, 7]
+            and all(c in "0123456789abcdefABCDEF" for c in bg[1:])
+        ):
+            bg = None
+
+    return fg, bg
+
+
+@lru_cache(maxsize=None)
+def resolve_theme_tags(
+    style,
+    default_fg: str,
+) -> tuple[tuple[str, str, str | None], ...]:
+    """Resolve a Pygments style into (tag, foreground, background) entries.
+
+    Cached per style and default foreground, so each new widget only replays
+    the entries with tag_configure instead of re-parsing the whole style.
+    """
+    styles_dict = style.styles
+    cache: dict[str, str] = {}
+    entries: list[tuple[str, str, str | None]] = []
+
+    # Track normal text color for comparison with bold
+    normal_text_color = None
+
+    # First pass: identify normal text color
+    for token, token_style in styles_dict.items():
+        if token_style != "":
+            cache[str(token)] = token_style
+
+        if token_style == "":
+            b = backoff(str(token))
+            if b in cache:
+                token_style = cache[b]
+
+        fg, bg = parse_style(token_style, default_fg)
+
+        # Track normal text color (Token.Text or Token)
+        token_name = str(token)
+        if token_name in ["Token.Text", "Token"] and fg:
+            normal_text_color = fg
+            break
+
+    # Resolve colors for syntax highlighting tags
+    for token, token_style in styles_dict.items():
+        try:
+            if token_style != "":
+                cache[str(token)] = token_style
+
+            if token_style == "":
+                b = backoff(str(token))
+                if b in cache:
+                    token_style = cache[b]
+
+            fg, bg = parse_style(token_style, default_fg)
+
+            # Check if this is a bold token that needs blue enhancement
+            token_name = str(token)
+            is_bold_token = (
+                "Strong" in token_name
+                or "Bold" in token_name
+                or token_name == "Token.Generic.Strong"
+                or token_name == "Token.Generic.Heading"
+                or token_name == "Token.Generic.Subheading"
+            )
+
+            # If this is a bold token and its color matches normal text, make it more blue
+            if is_bold_token and fg and normal_text_color and fg == normal_text_color:
+                fg = make_color_more_blue(fg)
+
+            # Only configure tags with valid colors
+            if fg and fg.startswith("#"):
+                if not (bg and bg.startswith("#")):
+                    bg = None
+                entries.append((token_name, fg, bg))
+
+        except Exception as token_error:
+            print(
+                f"Error resolving token {token} with style '{token_style}': {token_error}",
+            )
+
+    return tuple(entries)
+
 
 class SyntaxHighlightingMixin:
     """Mixin class containing all syntax highlighting functionality."""
@@ -25,6 +219,7 @@ class SyntaxHighlightingMixin:
             for tag in self.tag_names():
                 if tag not in ["sel", "highlight", "separator", "default"]:
                     self.tag_delete(tag)
+            self.syntax_tags.clear()
 
             # Multiple levels of safety checks
             if self.style is None:
@@ -46,91 +241,21 @@ class SyntaxHighlightingMixin:
 
             print(f"Configuring tags for {len(styles_dict)} style entries")
 
-            cache: dict[str, str] = {}
             successful_configs = 0
             failed_configs = 0
 
-            # Track normal text color for comparison with bold
-            normal_text_color = None
-
-            # First pass: identify normal text color
-            for token, style in styles_dict.items():
-                if style != "":
-                    cache[str(token)] = style
-
-                if style == "":
-                    b = backoff(str(token))
-                    if b in cache:
-                        style = cache[b]
-
-                fg, bg = self.parse_style(style)
-
-                # Track normal text color (Token.Text or Token)
-                token_name = str(token)
-                if token_name in ["Token.Text", "Token"] and fg:
-                    normal_text_color = fg
-                    break
-
-            # Configure tags for syntax highlighting
-            for token, style in styles_dict.items():
+            for tag, fg, bg in resolve_theme_tags(self.style, self.fg_color):
                 try:
-                    if style != "":
-                        cache[str(token)] = style
-
-                    if style == "":
-                        b = backoff(str(token))
-                        if b in cache:
-                            style = cache[b]
-
-                    fg, bg = self.parse_style(style)
-
-                    # Check if this is a bold token that needs blue enhancement
-                    token_name = str(token)
-                    is_bold_token = (
-                        "Strong" in token_name
-                        or "Bold" in token_name
-                        or token_name == "Token.Generic.Strong"
-                        or token_name == "Token.Generic.Heading"
-                        or token_name == "Token.Generic.Subheading"
-                    )
-
-                    # print(f"{token_name}: {is_bold_token}")
-                    # If this is a bold token and its color matches normal text, make it more blue
-                    if (
-                        is_bold_token
-                        and fg
-                        and normal_text_color
-                        and fg == normal_text_color
-                    ):
-                        # if is_bold_token:
-                        fg = self._make_color_more_blue(fg)
-                        # print(f"-----> {token_name}, {fg}")
-
-                    # Only configure tags with valid colors
-                    if fg and fg.startswith("#"):
-                        try:
-                            if bg and bg.startswith("#"):
-                                self.tag_configure(
-                                    str(token),
-                                    foreground=fg,
-                                    background=bg,
-                                )
-                            else:
-                                self.tag_configure(str(token), foreground=fg)
-                            successful_configs += 1
-                        except tk.TclError as tcl_error:
-                            print(
-                                f"Tkinter error configuring token {token} with fg={fg}, bg={bg}: {tcl_error}",
-                            )
-                            failed_configs += 1
-                            continue
-
-                except Exception as token_error:
+                    if bg:
+                        self.tag_configure(tag, foreground=fg, background=bg)
+                    else:
+                        self.tag_configure(tag, foreground=fg)
+                    successful_configs += 1
+                except tk.TclError as tcl_error:
                     print(
-                        f"Error configuring token {token} with style '{style}': {token_error}",
+                        f"Tkinter error configuring token {tag} with fg={fg}, bg={bg}: {tcl_error}",
                     )
                     failed_configs += 1
-                    continue
 
             print(
                 f"Theme configuration complete: {successful_configs} successful, {failed_configs} failed",
@@ -138,108 +263,13 @@ class SyntaxHighlightingMixin:
 
         except Exception as e:
             print(f"Error configuring theme tags: {e}")
-            import traceback
-
             traceback.print_exc()
 
-    def _make_color_more_blue(self, color: str) -> str:
-        """Make a color more blue-ish by increasing the blue component."""
-        try:
-            if color.lower() == "#000000":
-                return "#4444dd"
-            # Parse hex color
-            if color.startswith("#"):
-                hex_color = color[1:]
-
-                # Handle both 3 and 6 character hex codes
-                if len(hex_color) == 3:
-                    r = int(hex_color[0] * 2, 16)
-                    g = int(hex_color[1] * 2, 16)
-                    b = int(hex_color[2] * 2, 16)
-                elif len(hex_color) == 6:
-                    r = int(hex_color[0:2], 16)
-                    g = int(hex_color[2:4], 16)
-                    b = int(hex_color[4:6], 16)
-                else:
-                    return color
-
-                # Increase blue component and slightly decrease red/green
-                # This creates a more noticeable blue tint
-                r = max(0, int(r * 0.7))  # Reduce red by 30%
-                g = max(0, int(g * 0.7))  # Reduce green by 30%
-                b = min(255, int(b * 1.5) + 80)  # Increase blue by 50% and add 80
-
-                # Return new color
-                return f"#{r:02x}{g:02x}{b:02x}"
-
-        except Exception as e:
-            print(f"Error making color more blue: {e}")
-
-        return color
-
     def parse_style(
         self,
         style: str | dict[str, str],
     ) -> tuple[str, str | None]:
-        fg: str | None = None
-        bg: str | None = None
-
-        if isinstance(style, str):
-            parts = style.split()
-            for part in parts:
-                part = part.strip()
-                if part.startswith("bg:"):
-                    bg = part.split("bg:")[1]
-                elif part.startswith("border:"):
-                    # Skip border properties as Tkinter doesn't support them
-                    continue
-                elif part.startswith("#"):
-                    # This is a color hex code
-                    fg = part
-                elif part in ["bold", "italic", "underline"]:
-                    # Handle text formatting (could be extended later)
-                    continue
-                elif part.startswith("color:"):
-                    # Handle CSS-style color property
-                    fg = part.split("color:")[1]
-                elif part.startswith("background:") or part.startswith(
-                    "background-color:",
-                ):
-                    # Handle CSS-style background property
-                    bg = part.split(":")[-1]
-
-        elif isinstance(style, dict):
-            fg = style.get("color")
-            bg = style.get("bgcolor")
-
-        # Set default foreground color if not found
-        if not fg:
-            fg = self.fg_color
-
-        # Validate colors - ensure they start with # and are valid hex
-        if fg and not fg.startswith("#"):
-            if fg.startswith("color:"):
-                fg = fg.split("color:")[-1]
-            # If it's still not a valid hex color, use default
-            if not (
-                fg.startswith("#")
-                and len(fg) in [4, 7]
-                and all(c in "0123456789abcdefABCDEF" for c in fg[1:])
-            ):
-                fg = "#ffffff"
-
-        if bg and not bg.startswith("#"):
-            if bg.startswith("bg:"):
-                bg = bg.split("bg:")[-1]
-            # If it's not a valid hex color, ignore it
-            if not (
-                bg.startswith("#")
-                and len(bg) in [4, 7]
-                and all(c in "0123456789abcdefABCDEF" for c in bg[1:])
-            ):
-                bg = None
-
-        return fg, bg
+        return parse_style(style, self.fg_color)
 
     def highlight_text(self) -> None:
         """Main highlighting method - now uses incremental approach."""
@@ -257,6 +287,10 @@ class SyntaxHighlightingMixin:
         current_content = self.get("1.0", tk.END)
         current_length = len(current_content)
 
+        # Navigation keys and repeated calls leave the text untouched
+        if current_content == self.last_highlighted_content:
+            return
+
         # If content is significantly different, do full highlight
         if (
             not self.last_highlighted_content
@@ -279,7 +313,12 @@ class SyntaxHighlightingMixin:
         ):
             if current_length > self.last_highlighted_length:
                 # Only new content added at end
-                self._highlight_from_char_position(self.last_highlighted_length)
+                self._highlight_from_char_position(
+                    self.last_highlighted_length,
+                    content=current_content,
+                )
+                self.last_highlighted_content = current_content
+                self.last_highlighted_length = current_length
             return
 
         # Check if the change is within a code block and adjust start position
@@ -288,8 +327,19 @@ class SyntaxHighlightingMixin:
             current_content,
         )
 
+        # Stop at the end of the edited paragraph when that is safe
+        region_end = self._find_region_end(
+            self.last_highlighted_content,
+            current_content,
+            change_start,
+        )
+
         # Highlight from adjusted change point
-        self._highlight_from_char_position(adjusted_change_start)
+        self._highlight_from_char_position(
+            adjusted_change_start,
+            region_end,
+            current_content,
+        )
 
         # Update tracking variables
         self.last_highlighted_content = current_content
@@ -334,64 +384,95 @@ class SyntaxHighlightingMixin:
             print(f"Error adjusting change start for code block: {e}")
             return change_start
 
-    def _highlight_from_char_position(self, char_pos: int) -> None:
-        """Highlight from a character position to the end."""
+    def _find_region_end(
+        self,
+        old_content: str,
+        new_content: str,
+        change_start: int,
+    ) -> int | None:
+        """Find where re-highlighting after a local edit can safely stop.
+
+        Returns the character position of the first blank line after the edit
+        that is outside a code fence, or None to highlight to the end. Edits
+        that add or remove fences change the lexer state for everything after
+        them, so they always highlight to the end.
+        """
+        if old_content.count("```") != new_content.count("```"):
+            return None
+
+        # The edit must be a single insertion or deletion at change_start
+        delta = len(new_content) - len(old_content)
+        if delta >= 0:
+            if new_content[change_start + delta :] != old_content[change_start:]:
+                return None
+            change_end = change_start + delta
+        else:
+            if new_content[change_start:] != old_content[change_start - delta :]:
+                return None
+            change_end = change_start
+
+        blank_line = new_content.find("\n\n", change_end)
+        while blank_line >= 0:
+            if new_content.count("```", 0, blank_line) % 2 == 0:
+                return blank_line + 1
+            blank_line = new_content.find("\n\n", blank_line + 2)
+        return None
+
+    def _highlight_from_char_position(
+        self,
+        char_pos: int,
+        end_pos: int | None = None,
+        content: str | None = None,
+    ) -> None:
+        """Highlight from a character position to end_pos, or to the end."""
         try:
+            if content is None:
+                content = self.get("1.0", tk.END)
             # Convert character position to Tkinter index
-            tk_index = self._char_pos_to_tk_index(char_pos)
-            if tk_index:
-                self.highlight_region(tk_index, tk.END)
+            tk_index = self._char_pos_to_tk_index(char_pos, content)
+            end_index = tk.END
+            if end_pos is not None:
+                end_index = self._char_pos_to_tk_index(end_pos, content)
+            self.highlight_region(tk_index, end_index)
         except Exception as e:
             print(f"Error in incremental highlighting: {e}")
             self.highlight_text_full()
 
-    def _char_pos_to_tk_index(self, char_pos: int) -> str | None:
-        """Convert character position to Tkinter line.column format, returning start of line."""
-        try:
-            # Get content without the automatic trailing newline
-            content = self.get("1.0", "end-1c")
-            if "\r" in content:
-                print("Warning: Found \\r in content")
-
-            # Handle boundary cases
-            if char_pos < 0:
-                return "1.0"
-            if char_pos >= len(content):
-                # Return start of last line
-                lines = content.split("\n")
-                return f"{len(lines)}.0"
-
-            # Split content into lines using \n only
-            lines = content.split("\n")
-
-            current_pos = 0
-            for line_num, line in enumerate(lines, 1):
-                line_end = current_pos + len(line)
-
-                if char_pos <= line_end:
-                    # Return start of this line instead of exact position
-                    tk_index = f"{line_num}.0"
-
-                    # Validate before returning
-                    try:
-                        self.index(tk_index)
-                        return tk_index
-                    except tk.TclError:
-                        return None
-
-                # +1 for the newline character
-                current_pos = line_end + 1
-
-            return None
-
-        except (tk.TclError, ValueError, IndexError):
-            return None
+    def _char_pos_to_tk_index(
+        self,
+        char_pos: int,
+        content: str | None = None,
+    ) -> str:
+        """Convert character position to Tkinter line.column format, returning start of line.
+
+        content is the widget text as returned by get("1.0", END); it is fetched
+        when not supplied. The line number is a newline count, so no per-line
+        walk or Tcl validation is needed.
+        """
+        if content is None:
+            content = self.get("1.0", tk.END)
+        if char_pos < 0:
+            return "1.0"
+        # Ignore the trailing newline Tk always appends to END
+        char_pos = min(char_pos, len(content) - 1)
+        line_num = content.count("\n", 0, char_pos) + 1
+        return f"{line_num}.0"
 
     def _find_change_start(self, old_content: str, new_content: str) -> int:
         """Find the character position where content starts to differ."""
         min_length = min(len(old_content), len(new_content))
 
-        for i in range(min_length):
+        # Skip the shared prefix a block at a time with C-level slice compares,
+        # then walk the first differing block character by character.
+        block_start = 0
+        while (
+            block_start < min_length
+            and old_content[block_start : block_start + CHANGE_SCAN_BLOCK]
+            == new_content[block_start : block_start + CHANGE_SCAN_BLOCK]
+        ):
+            block_start += CHANGE_SCAN_BLOCK
+
+        for i in range(block_start, min(block_start + CHANGE_SCAN_BLOCK, min_length)):
             if old_content[i] != new_content[i]:
                 return i
 
@@ -432,10 +513,7 @@ class SyntaxHighlightingMixin:
                 pass
 
             # Only remove syntax tags in the region we're updating
-            # Keep important tags like selection
-            for tag in self.tag_names():
-                if tag not in ["sel", "highlight", "separator", "default"]:
-                    self.tag_remove(tag, start_index, end_index)
+            self._remove_syntax_tags(start_index, end_index)
 
             leading = count_leading_chars(region_text, "\n")
             region_text = region_text.lstrip("\n")
@@ -444,25 +522,10 @@ class SyntaxHighlightingMixin:
             tokens = self.token_cache.get_tokens(region_text, self.lexer)
 
             # Apply highlighting to the region
-            current_pos = (
-                str(int(start_index.split(".")[0]) + leading)
-                + "."
-                + start_index.split(".")[1]
-            )
+            start_line, start_col = map(int, self.index(start_index).split("."))
 
-            # pygments ignores leading \n, the above aligns tkinter's view with pygments view (DO NOT CHANGE)
-
-            for token, content in tokens:
-                # if content:
-                content_length = len(content)
-                try:
-                    end_pos = self.index(f"{current_pos} + {content_length}c")
-                    self.tag_add(str(token), current_pos, end_pos)
-                    current_pos = end_pos
-                except tk.TclError:
-                    # If we can't calculate the position, break out
-                    print("breaking")
-                    break
+            # pygments ignores leading \n, the line offset aligns tkinter's view with pygments view (DO NOT CHANGE)
+            self._tag_tokens(tokens, start_line + leading, start_col)
 
             # Restore selection if it existed
             if has_selection and sel_start and sel_end:
@@ -476,11 +539,61 @@ class SyntaxHighlightingMixin:
         finally:
             self.highlighting_in_progress = False
 
+    def _remove_syntax_tags(self, start_index: str, end_index: str) -> None:
+        """Remove the token tags this highlighter has applied from a range.
+
+        Only tags recorded in syntax_tags are touched, so selection, find
+        and separator tags survive and no Tcl call is spent on them.
+        """
+        for tag in self.syntax_tags:
+            self.tag_remove(tag, start_index, end_index)
+
+    def _tag_tokens(self, tokens, line: int, col: int) -> None:
+        """Tag tokens starting at line.col, computing indices from the token text.
+
+        Tracking line and column in Python avoids asking Tk to resolve a
+        "+Nc" offset expression for every token. Adjacent tokens of the same
+        type are merged into one range, and all ranges of a tag are applied
+        with a single multi-range tag_add.
+        """
+        ranges_by_tag: dict[str, list[str]] = {}
+        run_ranges: list[str] = []
+        run_tag = None
+        for token, content in tokens:
+            if not content:
+                continue
+            tag = TOKEN_TAG_NAMES.get(token)
+            if tag is None:
+                tag = TOKEN_TAG_NAMES[token] = str(token)
+            if tag != run_tag:
+                if run_tag is not None:
+                    run_ranges.append(f"{line}.{col}")
+                run_tag = tag
+                run_ranges = ranges_by_tag.setdefault(tag, [])
+                run_ranges.append(f"{line}.{col}")
+            newlines = content.count("\n")
+            if newlines:
+                line += newlines
+                col = len(content) - content.rfind("\n") - 1
+            else:
+                col += len(content)
+        if run_tag is not None:
+            run_ranges.append(f"{line}.{col}")
+        self.syntax_tags.update(ranges_by_tag)
+        for tag, ranges in ranges_by_tag.items():
+            self.tag_add(tag, *ranges)
+
     def highlight_text_full(self) -> None:
-        """Full highlighting - fallback for when incremental won't work."""
-        if self.highlighting_in_progress:
+        """Full highlighting - fallback for when incremental won't work.
+
+        Long buffers are lexed on HIGHLIGHT_EXECUTOR and tagged when the
+        tokens come back; a newer full pass supersedes one still in flight.
+        """
+        if self.highlighting_in_progress and not self.background_highlight_pending:
             return
 
+        self.highlight_generation += 1
+        self.background_highlight_pending = False
         self.highlighting_in_progress = True
 
         try:
@@ -497,90 +610,133 @@ class SyntaxHighlightingMixin:
             #     self.tag_add("default", "1.0", "end")
             #     return
 
-            self.skip_highlighting_reason = None
-
-            # Save the current selection if any
-            try:
-                sel_start = self.index(tk.SEL_FIRST)
-                sel_end = self.index(tk.SEL_LAST)
-                has_selection = True
-            except tk.TclError:
-                has_selection = False
+            if len(text) > BACKGROUND_LEX_THRESHOLD:
+                self.background_highlight_pending = True
+                HIGHLIGHT_EXECUTOR.submit(
+                    self._lex_in_background,
+                    text,
+                    self.highlight_generation,
+                )
+                return
 
-            # Remove ALL syntax tags except selection and special ones
-            for tag in self.tag_names():
-                if tag not in ["sel", "highlight", "separator", "default"]:
-                    self.tag_remove(tag, "1.0", "end")
+            self._apply_full_highlight(text)
 
-            # Reapply default tag
-            self.tag_add("default", "1.0", "end")
+        finally:
+            if not self.background_highlight_pending:
+                self.highlighting_in_progress = False
 
-            # Apply syntax highlighting
-            self.mark_set("highlight_start", "1.0")
-            try:
-                tokens = self.token_cache.get_tokens(text, self.lexer)
-                for token, content in tokens:
-                    if content:
-                        content_length = len(content)
-                        end_index = self.index(f"highlight_start + {content_length}c")
-                        self.tag_add(str(token), "highlight_start", end_index)
-                        self.mark_set("highlight_start", end_index)
-
-            except Exception as e:
-                print(f"Error during full highlighting: {e}")
-            finally:
-                try:
-                    self.mark_unset("highlight_start")
-                except:
-                    pass
+    def _lex_in_background(self, text: str, generation: int) -> None:
+        """Tokenize text on the highlight worker and hand the result to Tk."""
+        try:
+            tokens = list(self.lexer.get_tokens(text))
+        except Exception as e:
+            print(f"Error during background lexing: {e}")
+            tokens = []
+        try:
+            self.after(0, self._finish_background_highlight, text, tokens, generation)
+        except (tk.TclError, RuntimeError):
+            # The widget or the Tk main loop is gone
+            pass
 
-            # Restore the selection if it existed
-            if has_selection:
-                try:
-                    self.tag_add(tk.SEL, sel_start, sel_end)
-                except:
-                    pass
+    def _finish_background_highlight(
+        self,
+        text: str,
+        tokens: list,
+        generation: int,
+    ) -> None:
+        """Apply tokens lexed in the background if they still match the text."""
+        if generation != self.highlight_generation:
+            return
 
-            # Update tracking variables
-            current_content = self.get("1.0", tk.END)
-            self.last_highlighted_content = current_content
-            self.last_highlighted_length = len(current_content)
+        self.background_highlight_pending = False
+        self.highlighting_in_progress = False
 
-            # Force a visual update
-            self.update_idletasks()
+        current_content = self.get("1.0", tk.END)
+        # Appended text (streaming) keeps the lexed prefix valid; any other
+        # edit shifts the indices, so lex again.
+        if current_content != text and not current_content.startswith(text[:-1]):
+            self.highlight_text_full()
+            return
 
+        self.highlighting_in_progress = True
+        try:
+            self._apply_full_highlight(text, tokens)
         finally:
             self.highlighting_in_progress = False
 
+        if current_content != text:
+            self.highlight_text_incremental()
+
+    def _apply_full_highlight(self, text: str, tokens: list | None = None) -> None:
+        """Retag the whole buffer from text's tokens, lexing them if not given."""
+        self.skip_highlighting_reason = None
+
+        # Save the current selection if any
+        try:
+            sel_start = self.index(tk.SEL_FIRST)
+            sel_end = self.index(tk.SEL_LAST)
+            has_selection = True
+        except tk.TclError:
+            has_selection = False
+
+        # Remove ALL syntax tags
+        self._remove_syntax_tags("1.0", "end")
+
+        # Reapply default tag
+        self.tag_add("default", "1.0", "end")
+
+        # Apply syntax highlighting (pygments drops leading newlines)
+        try:
+            if tokens is None:
+                tokens = self.token_cache.get_tokens(text, self.lexer)
+            self._tag_tokens(tokens, 1 + count_leading_chars(text, "\n"), 0)
+        except Exception as e:
+            print(f"Error during full highlighting: {e}")
+
+        # Restore the selection if it existed
+        if has_selection:
+            try:
+                self.tag_add(tk.SEL, sel_start, sel_end)
+            except:
+                pass
+
+        # Update tracking variables
+        self.last_highlighted_content = text
+        self.last_highlighted_length = len(text)
+
     def highlight_code_block(self, start: str, end: str) -> None:
         # Remove any existing highlight
         self.tag_remove("highlight", "1.0", tk.END)
 
         # Get the text of the code block
         code_block = self.get(start, end)
-        lines = code_block.split("\n")
 
-        # Find the first and last non-backtick lines
+        # Locate the fence lines with one regex pass instead of stripping
+        # every line, then skip past them from either end
+        fence_lines = set()
+        line_num = 0
+        line_counted_to = 0
+        for match in CODE_FENCE_PATTERN.finditer(code_block):
+            line_num += code_block.count("\n", line_counted_to, match.start())
+            line_counted_to = match.start()
+            fence_lines.add(line_num)
+        line_count = code_block.count("\n") + 1
         first_line = next(
-            (i for i, line in enumerate(lines) if not line.strip().startswith("```")),
+            (i for i in range(line_count) if i not in fence_lines),
             0,
         )
         last_line = next(
-            (
-                len(lines) - 1 - i
-                for i, line in enumerate(reversed(lines))
-                if not line.strip().startswith("```")
-            ),
-            len(lines) - 1,
+            (i for i in reversed(range(line_count)) if i not in fence_lines),
+            line_count - 1,
         )
 
         # Calculate the new start and end positions
         new_start = f"{int(start.split('.')[0]) + first_line}.0"
         new_end = f"{int(start.split('.')[0]) + last_line}.end"
 
-        # Apply the highlight
+        # Apply the highlight above the token tags created since it was configured
         self.tag_add("highlight", new_start, new_end)
-        self.tag_configure("highlight", background="yellow", foreground="black")
+        self.tag_raise("highlight")
 
         # Schedule the removal of the highlight
-        self.after(500, lambda: self.tag_remove("highlight", new_start, new_end))
+        self.after(500, self.tag_remove, "highlight", new_start, new_end)
@@ -1,8 +1,9 @@
 import html
 import os
+import re
 import tempfile
 import webbrowser
-from typing import cast
+from functools import lru_cache
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -17,7 +18,11 @@ from pygments.styles import get_style_by_name
 
 # Add these imports for syntax highlighting
 
+# A fence line: optional indentation (any whitespace but newline), then ```.
+CODE_FENCE_PATTERN = re.compile(r"^([^\S\n]*)```(.*)$", re.MULTILINE)
 
+
+@lru_cache(maxsize=None)
 def backoff(x: str) -> str:
     parts = x.split(".")
     if len(parts) > 1:
@@ -46,60 +51,42 @@ def parse_code_blocks(text: str) -> list[tuple[int, str, int, int]]:
     Returns:
         List[Tuple[int, str, int, int]]: List of tuples (indentation_level, language, start_line, end_line)
     """
-    lines: list[str] = text.split("\n")
     blocks: list[tuple[int, str, int, int]] = []
-    open_blocks: list[dict[str, int | str]] = []  # Stack of open blocks
-
-    for line_idx, line in enumerate(lines):
-        line_num: int = line_idx + 1
-        leading_spaces: int = len(line) - len(line.lstrip())
-        stripped: str = line.strip()
-
-        if stripped.startswith("```"):
-            if stripped == "```":
-                # This is a plain ``` which could be either opening or closing
-
-                # Check if it's closing an existing block with the same indentation
-                # Search from most recent to earliest (reverse order)
-                matching_block_idx: int | None = None
-                for idx in range(len(open_blocks) - 1, -1, -1):
-                    if open_blocks[idx]["indent"] == leading_spaces:
-                        matching_block_idx = idx
-                        break
-
-                if matching_block_idx is not None:
-                    block = open_blocks[matching_block_idx]
-                    blocks.append(
-                        (
-                            cast(int, block["indent"]),
-                            cast(str, block["language"]),
-                            cast(int, block["start_line"]),
-                            line_num,
-                        ),
-                    )
-
-                    # Remove all these blocks from open_blocks
-                    open_blocks = open_blocks[:matching_block_idx]
-                else:
-                    # It's opening a new block
-                    open_blocks.append(
-                        {
-                            "indent": leading_spaces,
-                            "language": "",
-                            "start_line": line_num,
-                        },
-                    )
+    # Stack of open blocks as (indentation_level, language, start_line)
+    open_blocks: list[tuple[int, str, int]] = []
+
+    # Only fence lines matter, so let the regex engine skip everything else and
+    # keep a running newline count instead of splitting the whole text.
+    line_num: int = 1
+    line_counted_to: int = 0
+    for match in CODE_FENCE_PATTERN.finditer(text):
+        line_num += text.count("\n", line_counted_to, match.start())
+        line_counted_to = match.start()
+        leading_spaces: int = len(match.group(1))
+        language: str = match.group(2).strip()
+
+        if not language:
+            # This is a plain ``` which could be either opening or closing
+
+            # Check if it's closing an existing block with the same indentation
+            # Search from most recent to earliest (reverse order)
+            matching_block_idx: int | None = None
+            for idx in range(len(open_blocks) - 1, -1, -1):
+                if open_blocks[idx][0] == leading_spaces:
+                    matching_block_idx = idx
+                    break
+
+            if matching_block_idx is not None:
+                blocks.append((*open_blocks[matching_block_idx], line_num))
+
+                # Remove all these blocks from open_blocks
+                del open_blocks[matching_block_idx:]
             else:
-                # It's opening a new block with a language (```python, etc.)
-                language: str = stripped[3:].strip()
-
-                open_blocks.append(
-                    {
-                        "indent": leading_spaces,
-                        "language": language,
-                        "start_line": line_num,
-                    },
-                )
+                # It's opening a new block
+                open_blocks.append((leading_spaces, "", line_num))
+        else:
+            # It's opening a new block with a language (```python, etc.)
+            open_blocks.append((leading_spaces, language, line_num))
 
     return blocks
 
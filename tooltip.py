@@ -8,19 +8,16 @@ class ToolTip:
         self.widget = widget
         self.text = text
         self.tooltip: tk.Toplevel | None = None
+        self.label: tk.Label | None = None
         self.widget.bind("<Enter>", self.show_tooltip)
         self.widget.bind("<Leave>", self.hide_tooltip)
         self.is_macos = platform.system() == "Darwin"
 
-    def show_tooltip(self, event: tk.Event | None = None) -> None:
-        """Show the tooltip at the current cursor position."""
-        x = self.widget.winfo_rootx() + self.widget.winfo_width() // 2
-        y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
-
-        # Create the tooltip window
+    def create_tooltip(self) -> None:
+        """Create the tooltip window once; later hovers only show and hide it."""
         self.tooltip = tk.Toplevel(self.widget)
+        self.tooltip.withdraw()
         self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
 
         # Apply OS-specific settings
         if self.is_macos:
@@ -32,31 +29,44 @@ class ToolTip:
                 pass
 
         # Add the tooltip text
-        label = tk.Label(
+        self.label = tk.Label(
             self.tooltip,
             text=self.text,
             background="#ffffe0",
             relief="solid",
             borderwidth=1,
         )
-        label.pack()
+        self.label.pack()
 
         # For macOS, bind both mouse enter and click events
         if self.is_macos:
             self.tooltip.bind("<Button-1>", self.click_through)
-            label.bind("<Button-1>", self.click_through)
+            self.label.bind("<Button-1>", self.click_through)
             self.tooltip.bind("<Enter>", self.hide_tooltip)
-            label.bind("<Enter>", self.hide_tooltip)
+            self.label.bind("<Enter>", self.hide_tooltip)
+
+    def show_tooltip(self, event: tk.Event | None = None) -> None:
+        """Show the tooltip at the current cursor position."""
+        x = self.widget.winfo_rootx() + self.widget.winfo_width() // 2
+        y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
+
+        if self.tooltip is None or not self.tooltip.winfo_exists():
+            self.create_tooltip()
+        elif self.label is not None and self.label.cget("text") != self.text:
+            self.label.config(text=self.text)
+        self.tooltip.wm_geometry(f"+{x}+{y}")
+        self.tooltip.deiconify()
 
     def click_through(self, event: tk.Event | None = None) -> None:
         """Pass the click through to the underlying widget."""
         if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+            self.tooltip.withdraw()
             # Schedule the click event slightly after hiding the tooltip
             self.widget.after(10, lambda: self.widget.event_generate("<Button-1>"))
 
     def hide_tooltip(self, event: tk.Event | None = None) -> None:
         if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+            try:
+                self.tooltip.withdraw()
+            except tk.TclError:
+                self.tooltip = None
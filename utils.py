@@ -1,13 +1,113 @@
 import sys
+from collections.abc import Iterator
 from typing import NamedTuple
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.exceptions import ReadTimeoutError
+
+try:
+    from orjson import dumps as json_dumps
+    from orjson import loads as json_loads
+except ImportError:
+    from json import dumps
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes, matching orjson.dumps."""
+        return dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+# One pooled keep-alive session shared by every request to the Ollama server.
+OLLAMA_SESSION = requests.Session()
+OLLAMA_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+OLLAMA_SESSION.headers.update(
+    {"Connection": "keep-alive", "Accept-Encoding": "identity"},
+)
+# Fail fast when the server is down instead of waiting out the read timeout.
+CONNECT_TIMEOUT = 3.05
+
+
+# Ollama and the emulator emit compact JSON; other Ollama-compatible servers may
+# use json.dumps' default spacing.
+DONE_MARKER = b'"done":true'
+DONE_MARKER_SPACED = b'"done": true'
+CONTENT_KEY = b'"content":"'
+
+
+def fast_stream_content(line: bytes) -> str | None:
+    """Slice the message content out of a compact Ollama stream line.
+
+    Only handles the common case of content without escape sequences, where
+    the raw bytes are the decoded string. Returns None when the line needs a
+    real JSON parse.
+    """
+    start = line.find(CONTENT_KEY)
+    if start < 0:
+        return None
+    start += len(CONTENT_KEY)
+    end = line.find(b'"', start)
+    if end < 0 or line.find(b"\\", start, end) >= 0:
+        return None
+    return line[start:end].decode("utf-8")
+
 
 def is_macos() -> bool:
     return sys.platform == "darwin"
 
 
 class ContentUpdate(NamedTuple):
+    """Immutable unit of streamed answer content passed to the UI thread."""
+
     answer_index: int
     content_chunk: str
     is_done: bool = False
     is_error: bool = False
+
+
+def iter_response_chunks(
+    response: requests.Response,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """Yield body bytes as soon as they arrive, up to chunk_size at a time.
+
+    iter_content blocks until chunk_size bytes are buffered when the body is
+    not chunk-encoded, which holds back every line of the emulator servers'
+    close-delimited streams. read1 returns whatever one socket read produced.
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+    try:
+        while chunk := read1(chunk_size, decode_content=True):
+            yield chunk
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+
+
+def iter_ndjson_lines(
+    response: requests.Response,
+    chunk_size: int = 65536,
+) -> Iterator[bytes]:
+    """Yield the raw lines of a streamed newline-delimited JSON response.
+
+    Reads undecoded chunks and splits on b"\\n" directly, so no per-chunk
+    unicode decoding happens before the JSON parser sees the bytes.
+    """
+    buffer = bytearray()
+    for chunk in iter_response_chunks(response, chunk_size):
+        buffer += chunk
+        start = 0
+        newline = buffer.find(b"\n")
+        while newline >= 0:
+            yield bytes(buffer[start:newline])
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        if start:
+            del buffer[:start]
+    if buffer:
+        yield bytes(buffer)